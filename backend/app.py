@@ -4,12 +4,23 @@
 提供RESTful API接口和WebSocket实时通信
 """
 
+# eventlet 必须在其他模块之前打补丁，使线程、锁、套接字与 sleep 变为协作式
+import eventlet
+eventlet.monkey_patch()
+import eventlet.wsgi
+
 import os
 import sys
 import json
+import base64
+import socket
 import time
+import queue
 import threading
-from flask import Flask, request, jsonify
+from functools import wraps
+import numpy as np
+from flask import Flask, Response, abort, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 
@@ -20,68 +31,183 @@ from config import *
 from core.disk import VirtualDisk
 from core.filesystem import FileSystem, set_progress_callback
 from core.buffer import BufferManager
-from core.process import ProcessManager, CommandType, ProcessState
+from core.process import ProcessManager, CommandType, ProcessState, COMMAND_BY_VALUE
 from core.scheduler import RRScheduler, SchedulerState
-from core.ipc import SharedMemoryManager
+from core.ipc import SharedMemoryManager, ReadWriteLock
+from core.inode_decode import decode_inode, decode_inodes
+
+
+class CompactJSONProvider(DefaultJSONProvider):
+    """
+    JSON 响应：不排序键、直接输出UTF-8（中文消息不再转义为 \\uXXXX）
+    复用同一个紧凑编码器，省去每次响应构造编码器与循环引用检查的开销
+    """
+    sort_keys = False
+    ensure_ascii = False
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':'),
+            check_circular=False, default=self.default
+        ).encode
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._encode(obj)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(f'{self._encode(obj)}\n', mimetype=self.mimetype)
+
+
+class SocketJSON:
+    """
+    Socket.IO 报文编码：与 HTTP 响应共用同一个紧凑编码器（中文不转义）
+    广播时 python-socketio 对所有客户端只编码一次，这里只需替换编码器本身
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return app.json.dumps(obj)
+
+    loads = staticmethod(json.loads)
 
 
 # 创建Flask应用 (纯API模式，前后端分离)
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'os_filesystem_2025'
+app.json = CompactJSONProvider(app)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet', json=SocketJSON)
 
 # 初始化核心组件
 disk = VirtualDisk()
-filesystem = FileSystem(disk)
 buffer_manager = BufferManager(disk)
+filesystem = FileSystem(disk, buffer_manager)
 process_manager = ProcessManager()
 scheduler = RRScheduler(process_manager)
 shm_manager = SharedMemoryManager()
 
-# 将调度事件推送给前端
+# 长任务协程池：限制同时执行的任务数，超出的任务排队等待空位
+_task_pool = eventlet.GreenPool(LONG_TASK_POOL_SIZE)
+
+# 状态变更标记：修改类接口与调度事件置位，广播器仅在置位时推送
+_state_dirty = threading.Event()
+# 上一次广播的状态快照（用于计算增量）
+_last_status: dict = {}
+# 上一次广播时各子系统的版本号组合
+_last_status_version = None
+# 统计类接口的缓存：key -> (采集时刻或版本号, 结果)，状态变更时整体清空
+_stats_cache: dict = {}
+# 状态版本号：每次状态变更自增，与启动标识一起组成只读接口的 ETag
+_state_version = 0
+_BOOT_TAG = format(time.time_ns(), 'x')
+
+
+def _mark_state_dirty():
+    """标记系统状态已发生变化，并使统计缓存失效"""
+    global _state_version
+    _state_version += 1
+    _stats_cache.clear()
+    _state_dirty.set()
+
+
+def _cached(key: str, collect, ttl: float = STATS_CACHE_TTL):
+    """在 ttl 秒内复用同一 key 的采集结果，避免多个页面轮询时重复计算"""
+    now = time.monotonic()
+    entry = _stats_cache.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    value = collect()
+    _stats_cache[key] = (now, value)
+    return value
+
+
+def _versioned(key: str, version, collect):
+    """
+    版本号未变时复用同一 key 的采集结果
+    版本号须在采集前读取：采集期间若有修改，下次调用时版本不同会重新采集
+    """
+    entry = _stats_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    value = collect()
+    _stats_cache[key] = (version, value)
+    return value
+
+
+# WebSocket 出站事件队列：路由处理函数只负责入队，由后台发送线程合并发送
+_emit_queue: queue.Queue = queue.Queue()
+
+
+def _queue_emit(event: str, payload: dict, coalesce_key=None):
+    """
+    将事件放入出站队列（不阻塞请求线程）
+    
+    Args:
+        coalesce_key: 合并键；同一发送窗口内键相同的事件只发送最新的一条
+    """
+    _emit_queue.put((event, payload, coalesce_key))
+
+
+# 将调度事件推送给前端（调度器持锁调用，这里只入队）
 def _emit_scheduler_event(evt: dict):
-    try:
-        socketio.emit('scheduler_event', evt)
-    except Exception:
-        pass
+    _mark_state_dirty()
+    _queue_emit('scheduler_event', evt)
 
 
 scheduler.set_event_emitter(_emit_scheduler_event)
 
 # 设置文件操作进度回调（用于可视化延时）
 def on_file_progress(progress_info):
-    """文件操作进度回调"""
-    socketio.emit('file_progress', progress_info)
+    """文件操作进度回调（同一文件的同一操作只推送窗口内最新的进度）"""
+    _queue_emit('file_progress', progress_info,
+                coalesce_key=('file_progress', progress_info['operation'], progress_info['filename']))
 
 set_progress_callback(on_file_progress)
 
-# 全局锁（用于复杂操作的同步）
-global_lock = threading.RLock()
+# 全局读写锁：统计类接口以读者身份并发访问，格式化等替换全局组件的操作以写者身份独占
+state_rwlock = ReadWriteLock()
+
+
+def state_read_locked(func):
+    """
+    在全局读锁内执行：读写磁盘、文件系统或缓冲区的命令处理器与接口都经过这里，
+    格式化（写锁）会等待进行中的操作结束后才关闭旧磁盘，不会在操作中途失效
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with state_rwlock.read_lock():
+            return func(*args, **kwargs)
+    return wrapper
 
 
 # ==================== 注册命令处理器 ====================
+def _decode_content(args: dict, key: str = 'content') -> bytes:
+    """将 base64 形式的 <key>_b64 或 UTF-8 文本 <key> 转为字节；二进制内容走 base64 时无需 UTF-8 编码"""
+    encoded = args.get(f'{key}_b64')
+    if encoded is not None:
+        return base64.b64decode(encoded, validate=True)
+    return args.get(key, '').encode('utf-8')
+
+
+def _content_bytes(args: dict) -> bytes:
+    """取得命令参数中的内容字节；路由层已编码时直接复用，避免重复编码"""
+    content = args.get('content_bytes')
+    if content is None:
+        content = _decode_content(args)
+    return content
+
+
 def handle_create_file(args: dict, pid: int) -> dict:
     """处理创建文件命令 - 通过缓冲区创建"""
     filename = args.get('filename', '')
-    content = args.get('content', '').encode('utf-8')
-    
-    # 创建文件
-    result = filesystem.create_file(filename, content)
-    
-    if result.get('success') and content:
-        # 获取新文件的块列表，写入缓冲区
-        file_info = filesystem.get_file_info(filename)
-        blocks = file_info.get('blocks', [])
-        
-        content_offset = 0
-        for block_id in blocks:
-            block_content = content[content_offset:content_offset + BLOCK_SIZE]
-            if block_content:
-                buffer_manager.write_page(block_id, block_content, pid)
-                content_offset += BLOCK_SIZE
+    content = _content_bytes(args)
     
-    return result
+    # 文件系统的数据块写入直接进入缓冲区（标记为脏页）
+    return filesystem.create_file(filename, content, process_id=pid)
 
 
 def handle_read_file(args: dict, pid: int) -> dict:
@@ -95,24 +221,34 @@ def handle_read_file(args: dict, pid: int) -> dict:
         return file_info
     
     blocks = file_info.get('blocks', [])
+    total = file_info.get('size', 0)
     
-    # 通过缓冲区读取
+    # 通过缓冲区读取，按 iNode 记录的文件大小截取，而不是去掉块尾的 0 字节
     content = b''
     if not blocks:
         # 空文件
         content_str = ''
     elif block_index >= 0 and block_index < len(blocks):
-        # 读取指定块
+        # 读取指定块（最后一块只取有效部分）
         block_id = blocks[block_index]
         data = buffer_manager.read_page(block_id, pid)
         if data:
-            content = data.rstrip(b'\x00')
+            content = data[:max(0, min(BLOCK_SIZE, total - block_index * BLOCK_SIZE))]
     else:
-        # 读取所有块
+        # 读取所有块：按文件大小一次分配缓冲，逐块原地写入
+        content = bytearray(total)
+        offset = 0
+        block_size = BLOCK_SIZE
+        # 视图取得后立即拷入结果缓冲，无需先复制成 bytes
+        read_page = buffer_manager.read_page_view
         for block_id in blocks:
-            data = buffer_manager.read_page(block_id, pid)
+            if offset >= total:
+                break
+            n = min(block_size, total - offset)
+            data = read_page(block_id, pid)
             if data:
-                content += data.rstrip(b'\x00')
+                content[offset:offset + n] = data[:n]
+            offset += n
     
     # 将字节内容转换为字符串
     try:
@@ -138,29 +274,11 @@ def handle_read_file(args: dict, pid: int) -> dict:
 def handle_write_file(args: dict, pid: int) -> dict:
     """处理写入文件命令 - 通过缓冲区写入"""
     filename = args.get('filename', '')
-    content = args.get('content', '').encode('utf-8')
+    content = _content_bytes(args)
     block_index = args.get('block_index', -1)
     
-    # 先通过文件系统写入（这会分配块等）
-    result = filesystem.write_file(filename, content, block_index)
-    
-    if result.get('success'):
-        # 获取文件的块列表，通过缓冲区标记为已修改
-        file_info = filesystem.get_file_info(filename)
-        blocks = file_info.get('blocks', [])
-        
-        # 将内容写入缓冲区（标记为脏页）
-        content_offset = 0
-        for i, block_id in enumerate(blocks):
-            if block_index >= 0 and i != block_index:
-                continue
-            
-            block_content = content[content_offset:content_offset + BLOCK_SIZE]
-            if block_content:
-                buffer_manager.write_page(block_id, block_content, pid)
-                content_offset += BLOCK_SIZE
-    
-    return result
+    # 文件系统负责分配块，数据块写入直接进入缓冲区（标记为脏页）
+    return filesystem.write_file(filename, content, block_index, process_id=pid)
 
 
 def handle_delete_file(args: dict, pid: int) -> dict:
@@ -210,7 +328,7 @@ def handle_read_block(args: dict, pid: int) -> dict:
     """处理读取特定块命令"""
     filename = args.get('filename', '')
     block_index = args.get('block_index', 0)
-    result = filesystem.read_file(filename, block_index)
+    result = filesystem.read_file(filename, block_index, process_id=pid)
     if result.get('success') and 'content' in result:
         try:
             result['content'] = result['content'].decode('utf-8', errors='replace')
@@ -222,9 +340,42 @@ def handle_read_block(args: dict, pid: int) -> dict:
 def handle_write_block(args: dict, pid: int) -> dict:
     """处理写入特定块命令"""
     filename = args.get('filename', '')
-    content = args.get('content', '').encode('utf-8')
+    content = _content_bytes(args)
     block_index = args.get('block_index', 0)
-    return filesystem.write_file(filename, content, block_index)
+    return filesystem.write_file(filename, content, block_index, process_id=pid)
+
+
+_INODE_TYPE_NAMES = {0: '空闲', 1: '目录', 2: '普通文件'}
+
+
+def _inode_to_dict(inode_data: bytes, include_raw: bool = False) -> dict:
+    """
+    将 iNode 原始字节解析为接口字段
+    
+    Args:
+        inode_data: iNode 原始字节
+        include_raw: 是否附带原始字节的十六进制表示
+    """
+    (inode_id, file_type, permissions, size, create_time, modify_time,
+     link_count, direct_blocks, single_indirect, double_indirect) = decode_inode(inode_data)
+    
+    result = {
+        'inode_id': inode_id,
+        'type': _INODE_TYPE_NAMES.get(file_type, '未知'),
+        'type_code': file_type,
+        'permissions': permissions,
+        'size': size,
+        'create_time': create_time,
+        'modify_time': modify_time,
+        'link_count': link_count,
+        'direct_blocks': direct_blocks,
+        'direct_blocks_used': [b for b in direct_blocks if b > 0],
+        'single_indirect': single_indirect,
+        'double_indirect': double_indirect
+    }
+    if include_raw:
+        result['raw_hex'] = inode_data.hex()
+    return result
 
 
 def handle_view_inode(args: dict, pid: int) -> dict:
@@ -232,34 +383,7 @@ def handle_view_inode(args: dict, pid: int) -> dict:
     inode_id = args.get('inode_id', 0)
     try:
         inode_data = disk.read_inode(inode_id)
-        import struct
-        inode_id_val = struct.unpack_from('<H', inode_data, 0)[0]
-        file_type = struct.unpack_from('<B', inode_data, 2)[0]
-        permissions = struct.unpack_from('<B', inode_data, 3)[0]
-        size = struct.unpack_from('<I', inode_data, 4)[0]
-        create_time = struct.unpack_from('<Q', inode_data, 8)[0]
-        modify_time = struct.unpack_from('<Q', inode_data, 16)[0]
-        link_count = struct.unpack_from('<H', inode_data, 24)[0]
-        direct_blocks = [struct.unpack_from('<H', inode_data, 26 + i * 2)[0] for i in range(6)]
-        single_indirect = struct.unpack_from('<H', inode_data, 38)[0]
-        double_indirect = struct.unpack_from('<H', inode_data, 40)[0]
-        
-        type_names = {0: '空闲', 1: '目录', 2: '普通文件'}
-        return {
-            'success': True,
-            'inode_id': inode_id_val,
-            'type': type_names.get(file_type, '未知'),
-            'type_code': file_type,
-            'permissions': permissions,
-            'size': size,
-            'create_time': create_time,
-            'modify_time': modify_time,
-            'link_count': link_count,
-            'direct_blocks': [b for b in direct_blocks if b > 0],
-            'single_indirect': single_indirect,
-            'double_indirect': double_indirect,
-            'raw_hex': inode_data.hex()
-        }
+        return {'success': True, **_inode_to_dict(inode_data, include_raw=True)}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
@@ -306,7 +430,7 @@ def handle_shm_write(args: dict, pid: int) -> dict:
     """处理写入共享内存命令"""
     key = args.get('key', 1)
     offset = args.get('offset', 0)
-    content = args.get('content', '').encode('utf-8')
+    content = _content_bytes(args)
     success = shm_manager.write(key, offset, content, pid)
     return {'success': success, 'message': '写入成功' if success else '写入失败'}
 
@@ -324,31 +448,104 @@ def handle_sched_status(args: dict, pid: int) -> dict:
     return {'success': True, 'stats': stats, 'ready_queue': queue}
 
 
-# 注册处理器
-process_manager.register_handler(CommandType.CREATE_FILE, handle_create_file)
-process_manager.register_handler(CommandType.READ_FILE, handle_read_file)
-process_manager.register_handler(CommandType.WRITE_FILE, handle_write_file)
-process_manager.register_handler(CommandType.DELETE_FILE, handle_delete_file)
-process_manager.register_handler(CommandType.LIST_DIR, handle_list_dir)
-process_manager.register_handler(CommandType.MKDIR, handle_mkdir)
-process_manager.register_handler(CommandType.CD, handle_cd)
-process_manager.register_handler(CommandType.INFO, handle_file_info)
-process_manager.register_handler(CommandType.OPEN, handle_open_file)
-process_manager.register_handler(CommandType.CLOSE, handle_close_file)
-# 注册扩展处理器
-process_manager.register_handler(CommandType.READ_BLOCK, handle_read_block)
-process_manager.register_handler(CommandType.WRITE_BLOCK, handle_write_block)
-process_manager.register_handler(CommandType.VIEW_INODE, handle_view_inode)
-process_manager.register_handler(CommandType.LONG_TASK, handle_long_task)
-process_manager.register_handler(CommandType.SHM_CREATE, handle_shm_create)
-process_manager.register_handler(CommandType.SHM_READ, handle_shm_read)
-process_manager.register_handler(CommandType.SHM_WRITE, handle_shm_write)
-process_manager.register_handler(CommandType.SHM_LIST, handle_shm_list)
-process_manager.register_handler(CommandType.SCHED_STATUS, handle_sched_status)
+# 命令处理器表：一次性注册
+_HANDLERS = {
+    CommandType.CREATE_FILE: handle_create_file,
+    CommandType.READ_FILE: handle_read_file,
+    CommandType.WRITE_FILE: handle_write_file,
+    CommandType.DELETE_FILE: handle_delete_file,
+    CommandType.LIST_DIR: handle_list_dir,
+    CommandType.MKDIR: handle_mkdir,
+    CommandType.CD: handle_cd,
+    CommandType.INFO: handle_file_info,
+    CommandType.OPEN: handle_open_file,
+    CommandType.CLOSE: handle_close_file,
+    # 扩展处理器
+    CommandType.READ_BLOCK: handle_read_block,
+    CommandType.WRITE_BLOCK: handle_write_block,
+    CommandType.VIEW_INODE: handle_view_inode,
+    CommandType.LONG_TASK: handle_long_task,
+    CommandType.SHM_CREATE: handle_shm_create,
+    CommandType.SHM_READ: handle_shm_read,
+    CommandType.SHM_WRITE: handle_shm_write,
+    CommandType.SHM_LIST: handle_shm_list,
+    CommandType.SCHED_STATUS: handle_sched_status,
+}
+# 处理器统一在全局读锁内执行（无论是直接分派还是由调度器执行进程）
+process_manager.register_handlers({
+    command_type: state_read_locked(handler) for command_type, handler in _HANDLERS.items()
+})
+
+
+# ==================== 请求钩子 ====================
+def _json_body() -> dict:
+    """
+    直接解析请求体 JSON，跳过 get_json 的 Content-Type 检查与缓存
+    空请求体或 null 返回空字典，顶层不是对象（数组、数字等）时返回 400
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        abort(400)
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        abort(400)
+    return data
+
+
+def _request_content(data: dict, key: str = 'content') -> bytes:
+    """取得请求体中的内容字节（支持 <key>_b64），base64 非法时返回 400"""
+    try:
+        return _decode_content(data, key)
+    except (ValueError, TypeError, AttributeError):
+        abort(400)
+
+
+def requires_json(view):
+    """在解析请求体之前拒绝过大（413）或非 JSON 类型（415）的请求"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.content_length and request.content_length > MAX_JSON_BODY:
+            abort(413)
+        if request.content_length and request.mimetype != 'application/json':
+            abort(415)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def etag_cached(view):
+    """
+    只读接口的条件请求：以状态版本号作为弱 ETag，
+    客户端携带的 If-None-Match 仍然有效时直接返回 304，不再采集与序列化
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = f'{_BOOT_TAG}-{_state_version}'
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+        response.set_etag(etag, weak=True)
+        return response
+    return wrapper
+
+
+@app.after_request
+def track_state_change(response):
+    """修改类请求完成后标记状态变更"""
+    if request.method in ('POST', 'PUT', 'DELETE'):
+        _mark_state_dirty()
+    return response
 
 
 # ==================== 文件系统API ====================
 @app.route('/api/files', methods=['GET'])
+@etag_cached
+@state_read_locked
 def list_files():
     """获取文件列表"""
     result = filesystem.list_directory()
@@ -356,65 +553,100 @@ def list_files():
 
 
 @app.route('/api/files', methods=['POST'])
+@requires_json
 def create_file():
     """创建文件"""
-    data = request.get_json()
+    data = _json_body()
     filename = data.get('filename', '')
-    content = data.get('content', '').encode('utf-8')
+    # 只在路由层编码（或 base64 解码）一次，处理函数直接使用字节内容
+    content = _request_content(data)
     
-    # 创建进程执行命令
-    pid = process_manager.create_process(
-        name=f'create_{filename}',
-        command=CommandType.CREATE_FILE,
-        args={'filename': filename, 'content': data.get('content', '')}
+    # 简单命令直接分派（不创建PCB、不经过调度器）
+    result = process_manager.dispatch_direct(
+        CommandType.CREATE_FILE,
+        {'filename': filename, 'content_bytes': content}
     )
     
-    # 通知调度器
-    scheduler.add_process(pid)
-    
-    # 执行并等待结果
-    result = process_manager.execute_process(pid)
-    
     # 通过WebSocket通知前端更新
-    socketio.emit('file_created', {'filename': filename, 'result': result})
+    _queue_emit('file_created', {'filename': filename, 'result': result})
     
     return jsonify(result)
 
 
+@app.route('/api/files/bulk', methods=['POST'])
+@requires_json
+def create_files_bulk():
+    """批量创建文件：一次请求、一次通知（各文件仍按单个创建逐一执行，整批不是原子操作）"""
+    data = _json_body()
+    files = data.get('files')
+    if not isinstance(files, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('filename', ''), str) for item in files):
+        return jsonify({'success': False, 'error': 'files 需为对象数组，filename 需为字符串'}), 400
+    
+    # 先解码全部内容，任一内容非法时整批拒绝（400），不会只创建一部分
+    items = [(item.get('filename', ''), _request_content(item)) for item in files]
+    
+    results = []
+    for filename, content in items:
+        result = process_manager.dispatch_direct(
+            CommandType.CREATE_FILE,
+            {'filename': filename, 'content_bytes': content}
+        )
+        results.append({'filename': filename, 'result': result})
+    
+    created = sum(1 for r in results if r['result'].get('success'))
+    _queue_emit('files_created_bulk', {'created': created, 'results': results})
+    
+    return jsonify({
+        'success': created == len(results),
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    })
+
+
+@app.route('/api/files/visualize', methods=['POST'])
+@requires_json
+def set_files_visualize():
+    """开启或关闭文件读写的逐块可视化延时（batch：未逐块延时时是否在操作结束后一次性延时）"""
+    data = _json_body()
+    batch = data.get('batch')
+    filesystem.set_visualize_delay(bool(data.get('enabled', False)),
+                                   None if batch is None else bool(batch))
+    return jsonify({'success': True,
+                    'visualize_delay': filesystem.visualize_delay,
+                    'batch_delay': filesystem.batch_delay})
+
+
 @app.route('/api/files/<filename>', methods=['GET'])
 def read_file(filename):
     """读取文件"""
     block_index = request.args.get('block', -1, type=int)
     
-    pid = process_manager.create_process(
-        name=f'read_{filename}',
-        command=CommandType.READ_FILE,
-        args={'filename': filename, 'block_index': block_index}
+    result = process_manager.dispatch_direct(
+        CommandType.READ_FILE,
+        {'filename': filename, 'block_index': block_index}
     )
-    
-    scheduler.add_process(pid)
-    result = process_manager.execute_process(pid)
+    # 读取经过缓冲区，会改变缓冲统计
+    _mark_state_dirty()
     
     return jsonify(result)
 
 
 @app.route('/api/files/<filename>', methods=['PUT'])
+@requires_json
 def update_file(filename):
     """修改文件"""
-    data = request.get_json()
-    content = data.get('content', '')
+    data = _json_body()
+    content = _request_content(data)
     block_index = data.get('block_index', -1)
     
-    pid = process_manager.create_process(
-        name=f'write_{filename}',
-        command=CommandType.WRITE_FILE,
-        args={'filename': filename, 'content': content, 'block_index': block_index}
+    result = process_manager.dispatch_direct(
+        CommandType.WRITE_FILE,
+        {'filename': filename, 'content_bytes': content, 'block_index': block_index}
     )
     
-    scheduler.add_process(pid)
-    result = process_manager.execute_process(pid)
-    
-    socketio.emit('file_updated', {'filename': filename, 'result': result})
+    _queue_emit('file_updated', {'filename': filename, 'result': result})
     
     return jsonify(result)
 
@@ -422,21 +654,18 @@ def update_file(filename):
 @app.route('/api/files/<filename>', methods=['DELETE'])
 def delete_file(filename):
     """删除文件"""
-    pid = process_manager.create_process(
-        name=f'delete_{filename}',
-        command=CommandType.DELETE_FILE,
-        args={'filename': filename}
+    result = process_manager.dispatch_direct(
+        CommandType.DELETE_FILE,
+        {'filename': filename}
     )
     
-    scheduler.add_process(pid)
-    result = process_manager.execute_process(pid)
-    
-    socketio.emit('file_deleted', {'filename': filename, 'result': result})
+    _queue_emit('file_deleted', {'filename': filename, 'result': result})
     
     return jsonify(result)
 
 
 @app.route('/api/files/<filename>/info', methods=['GET'])
+@state_read_locked
 def file_info(filename):
     """获取文件信息"""
     result = filesystem.get_file_info(filename)
@@ -444,9 +673,10 @@ def file_info(filename):
 
 
 @app.route('/api/files/<filename>/open', methods=['POST'])
+@state_read_locked
 def open_file(filename):
     """打开文件"""
-    data = request.get_json() or {}
+    data = _json_body()
     mode = data.get('mode', 'r')
     process_id = data.get('process_id', 0)
     
@@ -455,9 +685,10 @@ def open_file(filename):
 
 
 @app.route('/api/files/<filename>/close', methods=['POST'])
+@state_read_locked
 def close_file(filename):
     """关闭文件"""
-    data = request.get_json() or {}
+    data = _json_body()
     process_id = data.get('process_id', 0)
     
     result = filesystem.close_file(filename, process_id)
@@ -466,29 +697,33 @@ def close_file(filename):
 
 # ==================== 目录API ====================
 @app.route('/api/mkdir', methods=['POST'])
+@requires_json
 def make_directory():
     """创建目录"""
-    data = request.get_json()
+    data = _json_body()
     dirname = data.get('dirname', '')
     
-    result = filesystem.create_directory(dirname)
-    socketio.emit('directory_created', {'dirname': dirname, 'result': result})
+    result = process_manager.dispatch_direct(CommandType.MKDIR, {'dirname': dirname})
+    _queue_emit('directory_created', {'dirname': dirname, 'result': result})
     
     return jsonify(result)
 
 
 @app.route('/api/cd', methods=['POST'])
+@requires_json
 def change_directory():
     """切换目录"""
-    data = request.get_json()
+    data = _json_body()
     dirname = data.get('dirname', '')
     
-    result = filesystem.change_directory(dirname)
-    socketio.emit('directory_changed', {'dirname': dirname, 'result': result})
+    result = process_manager.dispatch_direct(CommandType.CD, {'dirname': dirname})
+    _queue_emit('directory_changed', {'dirname': dirname, 'result': result})
     return jsonify(result)
 
 
 @app.route('/api/pwd', methods=['GET'])
+@etag_cached
+@state_read_locked
 def get_current_path():
     """获取当前工作目录"""
     result = filesystem.get_current_path()
@@ -497,60 +732,31 @@ def get_current_path():
 
 # ==================== iNode API ====================
 @app.route('/api/inode/<int:inode_id>', methods=['GET'])
+@state_read_locked
 def get_inode_info(inode_id):
     """获取iNode详细信息"""
     try:
         inode_data = disk.read_inode(inode_id)
-        import struct
-        inode_id_val = struct.unpack_from('<H', inode_data, 0)[0]
-        file_type = struct.unpack_from('<B', inode_data, 2)[0]
-        permissions = struct.unpack_from('<B', inode_data, 3)[0]
-        size = struct.unpack_from('<I', inode_data, 4)[0]
-        create_time = struct.unpack_from('<Q', inode_data, 8)[0]
-        modify_time = struct.unpack_from('<Q', inode_data, 16)[0]
-        link_count = struct.unpack_from('<H', inode_data, 24)[0]
-        direct_blocks = [struct.unpack_from('<H', inode_data, 26 + i * 2)[0] for i in range(6)]
-        single_indirect = struct.unpack_from('<H', inode_data, 38)[0]
-        double_indirect = struct.unpack_from('<H', inode_data, 40)[0]
-        
-        type_names = {0: '空闲', 1: '目录', 2: '普通文件'}
-        return jsonify({
-            'success': True,
-            'inode_id': inode_id_val,
-            'type': type_names.get(file_type, '未知'),
-            'type_code': file_type,
-            'permissions': permissions,
-            'size': size,
-            'create_time': create_time,
-            'modify_time': modify_time,
-            'link_count': link_count,
-            'direct_blocks': direct_blocks,
-            'direct_blocks_used': [b for b in direct_blocks if b > 0],
-            'single_indirect': single_indirect,
-            'double_indirect': double_indirect,
-            'raw_hex': inode_data.hex()
-        })
+        return jsonify({'success': True, **_inode_to_dict(inode_data, include_raw=True)})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 
 @app.route('/api/inode/list', methods=['GET'])
+@etag_cached
+@state_read_locked
 def list_inodes():
     """列出所有使用中的iNode"""
     try:
-        inodes = []
-        import struct
-        for i in range(32):  # MAX_INODES
-            inode_data = disk.read_inode(i)
-            file_type = struct.unpack_from('<B', inode_data, 2)[0]
-            if file_type != 0:  # 非空闲
-                size = struct.unpack_from('<I', inode_data, 4)[0]
-                type_names = {1: '目录', 2: '文件'}
-                inodes.append({
-                    'inode_id': i,
-                    'type': type_names.get(file_type, '未知'),
-                    'size': size
-                })
+        # 一次读出整个 iNode 区，只取类型与大小两列，筛选出非空闲的
+        table = decode_inodes(disk.read_inode_table())
+        file_types = table['file_type']
+        used = np.flatnonzero(file_types)
+        type_name = {1: '目录', 2: '文件'}.get
+        inodes = [
+            {'inode_id': i, 'type': type_name(t, '未知'), 'size': size}
+            for i, t, size in zip(used.tolist(), file_types[used].tolist(), table['size'][used].tolist())
+        ]
         return jsonify({'success': True, 'inodes': inodes, 'total': len(inodes)})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -558,34 +764,67 @@ def list_inodes():
 
 # ==================== 磁盘API ====================
 @app.route('/api/disk/info', methods=['GET'])
+@etag_cached
 def disk_info():
     """获取磁盘信息"""
-    info = disk.get_disk_info()
-    return jsonify(info)
+    return jsonify(_cached('disk_info', _collect_disk_info))
+
+
+def _collect_disk_info() -> dict:
+    """采集磁盘信息"""
+    with state_rwlock.read_lock():
+        return disk.get_disk_info()
 
 
 @app.route('/api/disk/bitmap', methods=['GET'])
+@etag_cached
 def disk_bitmap():
     """获取磁盘位图"""
-    bitmap = disk.get_bitmap_status()
-    return jsonify({
-        'bitmap': bitmap,
-        'total': len(bitmap),
-        'used': sum(bitmap),
-        'free': len(bitmap) - sum(bitmap)
-    })
+    return jsonify(_cached('disk_bitmap', _collect_disk_bitmap))
+
+
+def _collect_disk_bitmap() -> dict:
+    """采集磁盘位图（按位打包后 base64 编码，块 i 对应第 i//8 字节的第 i%8 位）"""
+    raw = disk.get_bitmap_raw()
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder='little')
+    total = int(bits.size)
+    used = int(bits.sum())
+    return {
+        'bitmap_b64': base64.b64encode(raw).decode('ascii'),
+        'total': total,
+        'used': used,
+        'free': total - used
+    }
+
+
+def _wants_octet_stream() -> bool:
+    """客户端是否明确要求原始字节（Accept: application/octet-stream）"""
+    return request.accept_mimetypes.best == 'application/octet-stream'
+
+
+def _binary_fields(data: bytes) -> dict:
+    """二进制内容的 JSON 表示：默认 base64，?encoding=hex 时额外给出旧的十六进制字段"""
+    fields = {'data_b64': base64.b64encode(data).decode('ascii')}
+    if request.args.get('encoding') == 'hex':
+        fields['data'] = data.hex()
+    fields['text'] = data.decode('utf-8', errors='replace')
+    return fields
 
 
 @app.route('/api/disk/block/<int:block_id>', methods=['GET'])
+@state_read_locked
 def read_block(block_id):
-    """读取指定磁盘块"""
+    """读取指定磁盘块（可按 Accept 直接返回原始字节）；块有缓冲页时返回缓冲页中的最新内容"""
     try:
-        data = disk.read_block(block_id)
+        data = buffer_manager.peek_block(block_id)
+        if data is None:
+            data = disk.read_block(block_id)
+        if _wants_octet_stream():
+            return Response(data, mimetype='application/octet-stream')
         return jsonify({
             'success': True,
             'block_id': block_id,
-            'data': data.hex(),
-            'text': data.decode('utf-8', errors='replace')
+            **_binary_fields(data)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -603,28 +842,40 @@ def format_disk():
     """格式化磁盘"""
     global disk, filesystem, buffer_manager
     
-    with global_lock:
-        # 删除旧的磁盘文件
+    with state_rwlock.write_lock():
+        # 卸载并删除旧的磁盘文件
         disk_path = disk.disk_path
+        disk.close()
         if os.path.exists(disk_path):
             os.remove(disk_path)
         
         # 重新创建磁盘和文件系统
         disk = VirtualDisk()
-        filesystem = FileSystem(disk)
+        visualize_delay = buffer_manager.visualize_delay
         buffer_manager = BufferManager(disk)
+        buffer_manager.set_visualize_delay(visualize_delay)
+        fs_delay = (filesystem.visualize_delay, filesystem.batch_delay)
+        filesystem = FileSystem(disk, buffer_manager)
+        filesystem.set_visualize_delay(*fs_delay)
     
-    socketio.emit('disk_formatted', {'message': '磁盘已格式化'})
+    _queue_emit('disk_formatted', {'message': '磁盘已格式化'})
     return jsonify({'success': True, 'message': '磁盘格式化完成'})
 
 
 # ==================== 缓冲区API ====================
 @app.route('/api/buffer/status', methods=['GET'])
+@etag_cached
 def buffer_status():
     """获取缓冲区状态"""
-    status = buffer_manager.get_buffer_status()
-    stats = buffer_manager.get_stats()
-    return jsonify({'pages': status, 'stats': stats})
+    return jsonify(_cached('buffer_status', _collect_buffer_status))
+
+
+def _collect_buffer_status() -> dict:
+    """采集缓冲区状态"""
+    with state_rwlock.read_lock():
+        status = buffer_manager.get_buffer_status()
+        stats = buffer_manager.get_stats()
+    return {'pages': status, 'stats': stats}
 
 
 @app.route('/api/buffer/page/<int:page_id>', methods=['GET'])
@@ -637,12 +888,23 @@ def buffer_page(page_id):
 
 
 @app.route('/api/buffer/flush', methods=['POST'])
+@state_read_locked
 def flush_buffer():
     """刷新所有缓冲页"""
     buffer_manager.flush_all()
+    disk.sync()
     return jsonify({'success': True, 'message': '缓冲区已刷新'})
 
 
+@app.route('/api/buffer/visualize', methods=['POST'])
+@requires_json
+def set_buffer_visualize():
+    """开启或关闭页面置换的可视化延时"""
+    data = _json_body()
+    buffer_manager.set_visualize_delay(bool(data.get('enabled', False)))
+    return jsonify({'success': True, 'visualize_delay': buffer_manager.visualize_delay})
+
+
 @app.route('/api/buffer/log', methods=['GET'])
 def buffer_log():
     """获取缓冲区置换日志"""
@@ -651,9 +913,10 @@ def buffer_log():
 
 
 @app.route('/api/buffer/access', methods=['POST'])
+@state_read_locked
 def buffer_access_block():
     """访问指定磁盘块；若不在缓冲中则触发置换"""
-    data = request.get_json(silent=True) or {}
+    data = _json_body()
     try:
         block_id = int(data.get('block_id', -1))
     except Exception:
@@ -666,9 +929,10 @@ def buffer_access_block():
 
 
 @app.route('/api/buffer/write', methods=['POST'])
+@state_read_locked
 def buffer_write_block():
     """在缓冲区中重写指定块的原有内容，标记为脏页但不修改数据。"""
-    data = request.get_json(silent=True) or {}
+    data = _json_body()
     try:
         block_id = int(data.get('block_id', -1))
     except Exception:
@@ -690,15 +954,15 @@ def list_processes():
 
 
 @app.route('/api/processes', methods=['POST'])
+@requires_json
 def create_process():
     """创建进程"""
-    data = request.get_json()
+    data = _json_body()
     command_str = data.get('command', 'ls')
     args = data.get('args', {})
     
-    try:
-        command = CommandType(command_str)
-    except ValueError:
+    command = COMMAND_BY_VALUE.get(command_str)
+    if command is None:
         return jsonify({'success': False, 'error': f'未知命令: {command_str}'})
     
     pid = process_manager.create_process(
@@ -737,7 +1001,7 @@ def get_process(pid):
 def execute_process(pid):
     """执行进程"""
     result = process_manager.execute_process(pid)
-    socketio.emit('process_completed', {'pid': pid, 'result': result})
+    _queue_emit('process_completed', {'pid': pid, 'result': result})
     return jsonify(result)
 
 
@@ -749,16 +1013,16 @@ def terminate_process(pid):
     return jsonify({'success': success})
 
 
-def _compute_steps_for_duration(duration_seconds: float) -> int:
-    """按当前时间片推导步数，使每步不超过一个时间片"""
-    quantum_sec = max(0.01, scheduler.time_quantum / 1000.0)
+def _compute_steps_for_duration(duration_seconds: float, quantum_ms: int) -> int:
+    """按时间片（毫秒）推导步数，使每步不超过一个时间片"""
+    quantum_sec = max(0.01, quantum_ms / 1000.0)
     return max(1, min(1000, int((duration_seconds / quantum_sec) + 0.999)))
 
 
 @app.route('/api/processes/longtask', methods=['POST'])
 def create_long_task():
     """创建长时间运行的任务（用于演示调度）"""
-    data = request.get_json() or {}
+    data = _json_body()
     try:
         duration = float(data.get('duration', 3))
     except Exception:
@@ -770,7 +1034,7 @@ def create_long_task():
     except Exception:
         steps = None
     if steps is None or steps <= 0:
-        steps = _compute_steps_for_duration(duration)
+        steps = _compute_steps_for_duration(duration, scheduler.time_quantum)
     
     pid = process_manager.create_process(
         name=task_name,
@@ -789,12 +1053,8 @@ def create_long_task():
     if scheduler.state == SchedulerState.STOPPED:
         scheduler.start()
     
-    # 启动一个工作线程来执行任务，但任务会协作式地让出CPU
-    def run_scheduled_task(task_pid):
-        execute_scheduled_long_task(task_pid, duration, steps, task_name)
-    
-    thread = threading.Thread(target=run_scheduled_task, args=(pid,), daemon=True)
-    thread.start()
+    # 提交到长任务协程池，任务会协作式地让出CPU
+    _submit_long_tasks([(pid, duration, steps, task_name)])
     
     return jsonify({
         'success': True,
@@ -803,13 +1063,31 @@ def create_long_task():
     })
 
 
+def _submit_long_tasks(tasks: list):
+    """
+    将长任务提交到协程池
+    池内空位足够时直接派生；否则交给后台协程逐个等待空位，请求无需等待
+    
+    Args:
+        tasks: (pid, duration, steps, task_name) 列表
+    """
+    def launch():
+        for task in tasks:
+            _task_pool.spawn_n(execute_scheduled_long_task, *task)
+    
+    if _task_pool.free() >= len(tasks):
+        launch()
+    else:
+        socketio.start_background_task(launch)
+
+
 def execute_scheduled_long_task(pid: int, duration: float, steps: int, task_name: str):
     """执行受调度器控制的长任务 - 时间片轮转协作"""
     process = process_manager.get_process(pid)
     if not process:
         return
     
-    socketio.emit('process_progress', {
+    _queue_emit('process_progress', {
         'pid': pid,
         'name': task_name,
         'status': 'started',
@@ -817,52 +1095,52 @@ def execute_scheduled_long_task(pid: int, duration: float, steps: int, task_name
     })
     
     time_quantum_sec = max(0.01, scheduler.time_quantum / 1000.0)  # 将毫秒转换为秒
-    # 将每步时间限制为一个时间片，步数足够覆盖总时长
+    # 将每步时间限制为一个时间片；步数由创建方给出，缺省时按时间片推导以覆盖总时长
     time_per_step = time_quantum_sec
-    steps = max(1, int((duration / time_per_step) + 0.999))
+    if steps is None or steps <= 0:
+        steps = _compute_steps_for_duration(duration, scheduler.time_quantum)
     completed_steps = 0
     if process:
         process.remaining_time = int(max(0, duration) * 1000)
     
-    last_slice_seen = -1
+    # 循环内反复用到的全局对象与枚举值固定为局部变量
+    sched = scheduler
+    get_process = process_manager.get_process
+    terminated = ProcessState.TERMINATED
+    running = ProcessState.RUNNING
+    sched_running = SchedulerState.RUNNING
+    step_sleep = min(time_per_step, 0.02)
+    
     while completed_steps < steps:
         # 检查进程状态
-        process = process_manager.get_process(pid)
-        if not process or process.state == ProcessState.TERMINATED:
+        process = get_process(pid)
+        if not process or process.state == terminated:
             break
 
-        # 等待一个新的时间片并且当前进程被调度
-        with scheduler.condition:
-            scheduler.condition.wait_for(
-                lambda: scheduler.state == SchedulerState.RUNNING
-                and scheduler.current_pid == pid
-                and scheduler.stats['time_slices_used'] > last_slice_seen,
-                timeout=2.0
-            )
-            current_slice = scheduler.stats['time_slices_used']
-            # 若未满足条件则重试
-            if scheduler.current_pid != pid or scheduler.state != SchedulerState.RUNNING or current_slice == last_slice_seen:
-                continue
-            # 确认被调度，设置为运行态
-            process = process_manager.get_process(pid)
-            if process and process.state != ProcessState.TERMINATED:
-                process.state = ProcessState.RUNNING
+        # 等待调度器分给本进程一个时间片（只有本进程会被唤醒）
+        if not sched.wait_for_slice(pid, timeout=2.0):
+            continue
+        # 若调度器已暂停或停止则重试
+        if sched.state != sched_running:
+            continue
+        # 确认被调度，设置为运行态（get_process 已加锁返回同一个PCB）
+        if process.state != terminated:
+            process.state = running
 
         # 在该时间片内执行一个步骤
-        time.sleep(min(time_per_step, 0.02))
+        socketio.sleep(step_sleep)
         completed_steps += 1
-        last_slice_seen = current_slice
 
-        # 发送进度更新（剩余时间由调度器扣减）
+        # 发送进度更新（剩余时间由调度器扣减），同一进程在发送窗口内只保留最新进度
         progress = (completed_steps / steps) * 100
-        socketio.emit('process_progress', {
+        _queue_emit('process_progress', {
             'pid': pid,
             'name': task_name,
             'status': 'running',
             'progress': progress,
             'current_step': completed_steps,
             'total_steps': steps
-        })
+        }, coalesce_key=('process_progress', pid))
     
     # 任务完成
     with process_manager.lock:
@@ -871,10 +1149,11 @@ def execute_scheduled_long_task(pid: int, duration: float, steps: int, task_name
             process.state = ProcessState.TERMINATED
             process.end_time = time.time()
             process.remaining_time = 0
+            process_manager.mark_changed()
     
     scheduler.notify_process_terminated(pid)
     
-    socketio.emit('process_progress', {
+    _queue_emit('process_progress', {
         'pid': pid,
         'name': task_name,
         'status': 'completed',
@@ -885,7 +1164,7 @@ def execute_scheduled_long_task(pid: int, duration: float, steps: int, task_name
 @app.route('/api/processes/batch', methods=['POST'])
 def create_batch_tasks():
     """批量创建任务（用于演示多进程调度）"""
-    data = request.get_json() or {}
+    data = _json_body()
     count = data.get('count', 3)
     duration_raw = data.get('duration', 3)
     durations_raw = data.get('durations')
@@ -918,14 +1197,17 @@ def create_batch_tasks():
         norm = normalize_duration(duration_raw, 3)
         durations_list = [norm if norm is not None else 0.3] * count
     
+    # 时间片只读一次，每个任务的步数只算一次
+    quantum_ms = scheduler.time_quantum
+    steps_list = [_compute_steps_for_duration(d, quantum_ms) for d in durations_list]
+    
     pids = []
     for i in range(count):
         task_name = f'批量任务_{i+1}'
-        steps_for_task = _compute_steps_for_duration(durations_list[i])
         pid = process_manager.create_process(
             name=task_name,
             command=CommandType.LONG_TASK,
-            args={'duration': durations_list[i], 'steps': steps_for_task, 'name': task_name}
+            args={'duration': durations_list[i], 'steps': steps_list[i], 'name': task_name}
         )
         proc = process_manager.get_process(pid)
         if proc:
@@ -937,18 +1219,11 @@ def create_batch_tasks():
     if scheduler.state == SchedulerState.STOPPED:
         scheduler.start()
     
-    # 启动工作线程
-    for i, pid in enumerate(pids):
-        task_name = f'批量任务_{i+1}'
-        def run_task(p, d, s, n):
-            execute_scheduled_long_task(p, d, s, n)
-        
-        thread = threading.Thread(
-            target=run_task, 
-            args=(pid, durations_list[i], _compute_steps_for_duration(durations_list[i]), task_name), 
-            daemon=True
-        )
-        thread.start()
+    # 一次性提交到长任务协程池
+    _submit_long_tasks([
+        (pid, durations_list[i], steps_list[i], f'批量任务_{i+1}')
+        for i, pid in enumerate(pids)
+    ])
     
     return jsonify({
         'success': True,
@@ -962,9 +1237,15 @@ def create_batch_tasks():
 @app.route('/api/scheduler/status', methods=['GET'])
 def scheduler_status():
     """获取调度器状态"""
-    stats = scheduler.get_stats()
-    ready_queue = scheduler.get_ready_queue()
-    return jsonify({'stats': stats, 'ready_queue': ready_queue})
+    return jsonify(_cached('scheduler_status', _collect_scheduler_status))
+
+
+def _collect_scheduler_status() -> dict:
+    """采集调度器状态"""
+    with state_rwlock.read_lock():
+        stats = scheduler.get_stats()
+        ready_queue = scheduler.get_ready_queue()
+    return {'stats': stats, 'ready_queue': ready_queue}
 
 
 @app.route('/api/scheduler/start', methods=['POST'])
@@ -997,9 +1278,10 @@ def resume_scheduler():
 
 @app.route('/api/scheduler/events', methods=['GET'])
 def scheduler_events():
-    """获取调度事件"""
+    """获取调度事件；带 since 时只返回该时刻及之后的事件（增量查询）"""
     count = request.args.get('count', 20, type=int)
-    events = scheduler.get_events(count)
+    since = request.args.get('since', None, type=float)
+    events = scheduler.get_events(count, since)
     return jsonify({'events': events})
 
 
@@ -1012,15 +1294,17 @@ def scheduler_clear_events():
 
 @app.route('/api/scheduler/gantt', methods=['GET'])
 def scheduler_gantt():
-    """获取甘特图数据"""
-    data = scheduler.get_gantt_data()
+    """获取甘特图数据；带 since 时只返回该时刻及之后的数据（增量查询）"""
+    since = request.args.get('since', None, type=float)
+    data = scheduler.get_gantt_data(since)
     return jsonify({'gantt': data})
 
 
 @app.route('/api/scheduler/quantum', methods=['PUT'])
+@requires_json
 def set_time_quantum():
     """设置时间片大小"""
-    data = request.get_json()
+    data = _json_body()
     quantum = data.get('quantum', TIME_QUANTUM)
     scheduler.set_time_quantum(quantum)
     return jsonify({'success': True, 'quantum': quantum})
@@ -1036,9 +1320,10 @@ def list_shm():
 
 
 @app.route('/api/shm', methods=['POST'])
+@requires_json
 def create_shm():
     """创建共享内存段"""
-    data = request.get_json()
+    data = _json_body()
     size = data.get('size', 1024)
     key = data.get('key')
     
@@ -1056,29 +1341,32 @@ def destroy_shm(key):
 
 
 @app.route('/api/shm/<int:key>/read', methods=['POST'])
+@requires_json
 def read_shm(key):
     """读取共享内存"""
-    data = request.get_json()
+    data = _json_body()
     offset = data.get('offset', 0)
     length = data.get('length', 64)
     process_id = data.get('process_id', 0)
     
     result = shm_manager.read(key, offset, length, process_id)
+    if result and _wants_octet_stream():
+        return Response(result, mimetype='application/octet-stream')
     if result:
         return jsonify({
             'success': True,
-            'data': result.hex(),
-            'text': result.decode('utf-8', errors='replace')
+            **_binary_fields(result)
         })
     return jsonify({'success': False, 'error': '读取失败'})
 
 
 @app.route('/api/shm/<int:key>/write', methods=['POST'])
+@requires_json
 def write_shm(key):
     """写入共享内存"""
-    data = request.get_json()
+    data = _json_body()
     offset = data.get('offset', 0)
-    content = data.get('data', '').encode('utf-8')
+    content = _request_content(data, 'data')
     process_id = data.get('process_id', 0)
     
     success = shm_manager.write(key, offset, content, process_id)
@@ -1086,17 +1374,38 @@ def write_shm(key):
 
 
 # ==================== 文件系统统计API ====================
+# /api/stats 的结构固定，只需分别序列化各子系统的统计后填入外层模板
+_STATS_TEMPLATE = '{{"disk":{},"filesystem":{},"buffer":{},"processes":{},"scheduler":{},"shm":{}}}'
+_dump_section = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_all_stats():
-    """获取所有统计信息"""
-    return jsonify({
-        'disk': disk.get_disk_info(),
-        'filesystem': filesystem.get_filesystem_stats(),
-        'buffer': buffer_manager.get_stats(),
-        'processes': process_manager.get_process_stats(),
-        'scheduler': scheduler.get_stats(),
-        'shm': shm_manager.get_stats()
-    })
+    """获取所有统计信息（缓存的是序列化后的响应体，各子系统版本号均未变时直接复用）"""
+    body = _versioned('stats', _stats_version(), _serialize_all_stats)
+    return Response(body, mimetype='application/json')
+
+
+def _stats_version() -> tuple:
+    """各子系统的版本号组合，任一子系统状态变化都会使其改变"""
+    return (disk.version, filesystem.version, buffer_manager.version,
+            process_manager.version, scheduler.version, shm_manager.version)
+
+
+def _serialize_all_stats() -> bytes:
+    """采集所有统计信息并按固定模板序列化"""
+    # 在同一个读锁区间内采集，保证各部分属于同一时刻的快照；磁盘信息只查询一次
+    with state_rwlock.read_lock():
+        disk_info = disk.get_disk_info()
+        sections = (
+            disk_info,
+            filesystem.get_filesystem_stats(disk_info),
+            buffer_manager.get_stats(),
+            process_manager.get_process_stats(),
+            scheduler.get_stats(),
+            shm_manager.get_stats()
+        )
+    return _STATS_TEMPLATE.format(*map(_dump_section, sections)).encode('utf-8')
 
 
 # ==================== WebSocket事件 ====================
@@ -1115,36 +1424,109 @@ def handle_disconnect():
 @socketio.on('get_status')
 def handle_get_status():
     """获取系统状态"""
-    emit('status', {
-        'disk': disk.get_disk_info(),
-        'buffer': buffer_manager.get_stats(),
-        'processes': process_manager.get_process_stats(),
-        'scheduler': scheduler.get_stats()
-    })
+    emit('status', _collect_status(include_processes=True))
+
+
+def _collect_status(include_processes: bool = False) -> dict:
+    """在一次读锁内采集状态快照（广播时不含进程统计）"""
+    with state_rwlock.read_lock():
+        status = {
+            'disk': disk.get_disk_info(),
+            'buffer': buffer_manager.get_stats()
+        }
+        if include_processes:
+            status['processes'] = process_manager.get_process_stats()
+        status['scheduler'] = scheduler.get_stats()
+        return status
+
+
+def _has_clients() -> bool:
+    """默认命名空间下是否有已连接的 WebSocket 客户端"""
+    participants = socketio.server.manager.get_participants('/', None)
+    return next(participants, None) is not None
 
 
 # 定期推送状态更新
 def status_broadcaster():
-    """状态广播器"""
+    """
+    状态广播器
+    仅在有客户端连接且状态被标记为变更时采集快照，并只推送与上次广播相比发生变化的部分；
+    前端按顶层字段合并，因此增量与全量快照格式兼容
+    """
+    global _last_status_version
     while True:
         try:
-            socketio.sleep(1)  # 使用 socketio.sleep 替代 time.sleep
-            socketio.emit('status_update', {
-                'timestamp': time.time(),
-                'disk': disk.get_disk_info(),
-                'buffer': buffer_manager.get_stats(),
-                'scheduler': scheduler.get_stats()
-            })
+            socketio.sleep(1)  # 使用 socketio.sleep 让出事件循环
+            # 无客户端时保留脏标记，待有客户端连接后再采集
+            if not _state_dirty.is_set() or not _has_clients():
+                continue
+            _state_dirty.clear()
+            
+            # 广播涉及的子系统版本号均未变化时无需采集（组合中保留对象本身，格式化替换对象后必然不同）
+            version = (disk, disk.version, buffer_manager, buffer_manager.version, scheduler.version)
+            if version == _last_status_version:
+                continue
+            _last_status_version = version
+            
+            snapshot = _collect_status()
+            delta = {k: v for k, v in snapshot.items() if _last_status.get(k) != v}
+            if not delta:
+                continue
+            _last_status.update(snapshot)
+            
+            delta['timestamp'] = time.time()
+            socketio.emit('status_update', delta)
         except Exception as e:
             # 忽略广播过程中的错误，避免线程崩溃
             pass
 
 
+def _coalesce_batch(batch: list) -> list:
+    """合并键相同的事件只保留最后一条（保持其在窗口内最后出现的位置）"""
+    last = {key: i for i, (_, _, key) in enumerate(batch) if key is not None}
+    if not last:
+        return batch
+    return [item for i, item in enumerate(batch) if item[2] is None or last[item[2]] == i]
+
+
+def event_emitter():
+    """
+    出站事件发送器
+    将 EMIT_BATCH_WINDOW 时间窗口内到达的事件合并为一个 batch 帧发送，
+    单帧最多 EMIT_BATCH_MAX 个事件；窗口内只有一个事件时按原事件名直接发送。
+    带合并键的进度类事件在窗口内只发送最新的一条
+    """
+    while True:
+        try:
+            batch = [_emit_queue.get()]
+            deadline = time.monotonic() + EMIT_BATCH_WINDOW
+            while len(batch) < EMIT_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(_emit_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            batch = _coalesce_batch(batch)
+            if len(batch) == 1:
+                event, payload, _ = batch[0]
+                socketio.emit(event, payload)
+            else:
+                socketio.emit('batch', [[event, payload] for event, payload, _ in batch])
+        except Exception:
+            # 忽略发送过程中的错误，避免线程崩溃
+            pass
+
+
 # ==================== 主程序入口 ====================
 if __name__ == '__main__':
-    # 启动状态广播线程
-    broadcaster = threading.Thread(target=status_broadcaster, daemon=True)
-    broadcaster.start()
+    # 启动状态广播任务
+    socketio.start_background_task(status_broadcaster)
+    
+    # 启动出站事件发送任务
+    socketio.start_background_task(event_emitter)
     
     # 启动调度器
     scheduler.start()
@@ -1161,4 +1543,13 @@ if __name__ == '__main__':
     print("=" * 50)
     
     # 启动Flask应用
-    socketio.run(app, host='0.0.0.0', port=3456, debug=False, allow_unsafe_werkzeug=True)
+    # 自行创建监听套接字并关闭 Nagle 算法，accept 得到的连接会继承该选项，
+    # 使小的事件帧无需等待合并即可立即发出
+    listener = eventlet.listen(('0.0.0.0', 3456))
+    listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        eventlet.wsgi.server(listener, app, log_output=False)
+    finally:
+        # 文件数据以脏页形式留在缓冲区，退出前写回并卸载磁盘
+        buffer_manager.flush_all()
+        disk.close()
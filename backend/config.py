@@ -20,6 +20,7 @@ DATA_START_BLOCK = SUPERBLOCK_BLOCKS + BITMAP_BLOCKS + INODE_BLOCKS  # 数据区
 INODE_SIZE = 64          # 每个iNode大小（字节）
 INODES_PER_BLOCK = BLOCK_SIZE // INODE_SIZE  # 每块可存放的iNode数
 MAX_INODES = INODE_BLOCKS * INODES_PER_BLOCK  # 最大iNode数量
+INODE_CACHE_SIZE = MAX_INODES  # iNode缓存容量（已解析的iNode个数）
 
 # 索引结构配置（混合索引）
 DIRECT_BLOCKS = 6        # 直接索引块数
@@ -30,10 +31,13 @@ POINTERS_PER_BLOCK = BLOCK_SIZE // 2  # 每块可存放的指针数（2字节/
 # ==================== 内存缓冲配置 ====================
 BUFFER_PAGE_COUNT = 8    # 缓冲页数量改为 8
 BUFFER_PAGE_SIZE = BLOCK_SIZE  # 缓冲页大小等于盘块大小
+BUFFER_A1IN_SIZE = max(1, BUFFER_PAGE_COUNT // 4)  # 2Q 置换：试用队列 A1in 的页数上限
+BUFFER_A1OUT_SIZE = BUFFER_PAGE_COUNT  # 2Q 置换：幽灵队列 A1out 记录的块号数上限
 
 # ==================== 进程调度配置 ====================
 TIME_QUANTUM = 100       # 时间片大小（毫秒）
 MAX_PROCESSES = 32       # 最大进程数
+LONG_TASK_POOL_SIZE = 64 # 同时执行的长任务协程上限
 
 # ==================== 文件权限 ====================
 PERM_READ = 0b100        # 读权限
@@ -43,6 +47,19 @@ PERM_EXECUTE = 0b001     # 执行权限
 # ==================== 可视化配置 ====================
 IO_DELAY = 0.3           # I/O操作延时（秒），用于可视化观察
 PAGE_SWAP_DELAY = 0.5    # 页面置换延时（秒）
+BUFFER_VISUALIZE_DELAY = False  # 是否默认开启页面置换延时（可通过接口切换）
+FS_VISUALIZE_DELAY = False     # 是否默认开启文件读写的逐块延时（需注册进度回调；可通过接口切换）
+FS_BATCH_IO_DELAY = False      # 未逐块延时时，是否在每次文件操作结束后一次性延时 N×IO_DELAY（模拟总耗时）
+
+# ==================== WebSocket配置 ====================
+EMIT_BATCH_WINDOW = 0.015  # 事件合并窗口（秒），窗口内的事件合并为一个batch帧
+EMIT_BATCH_MAX = 64        # 单个batch帧最多包含的事件数
+
+# ==================== 接口缓存配置 ====================
+STATS_CACHE_TTL = 0.25   # 统计类接口结果缓存时间（秒），状态变更时立即失效
+
+# ==================== 接口请求配置 ====================
+MAX_JSON_BODY = 1 << 20  # JSON请求体上限（字节），超过直接返回413
 
 # ==================== 磁盘文件路径 ====================
 DISK_FILE_PATH = "virtual_disk.bin"  # 模拟磁盘文件路径
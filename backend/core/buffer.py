@@ -1,19 +1,23 @@
 # -*- coding: utf-8 -*-
 """
 操作系统课程设计 - 内存缓冲页管理模块
-实现M×K大小的缓冲区，支持页面置换（LRU算法）
+实现M×K大小的缓冲区，支持页面置换（2Q算法）
 """
 
 import os
 import threading
 import time
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Any, Tuple
 from enum import Enum
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
 
+# 整页大小的全零缓冲：清零时切片其 memoryview，不会每次分配新的零字节串
+_ZEROS = memoryview(bytes(BUFFER_PAGE_SIZE))
+
 
 class PageState(Enum):
     """缓冲页状态"""
@@ -22,39 +26,47 @@ class PageState(Enum):
     DIRTY = 2      # 脏页（已修改）
 
 
-@dataclass
 class BufferPage:
     """
     缓冲页结构
     记录缓冲页的所有者、访问时间、修改状态等信息
+    使用 __slots__ 固定属性，缩小每页的内存占用并加快属性访问
     """
-    page_id: int                          # 缓冲页ID
-    block_id: int = -1                    # 对应的磁盘块号（-1表示未关联）
-    owner_process: int = -1               # 所有者进程ID（-1表示无主）
-    data: bytearray = field(default_factory=lambda: bytearray(BUFFER_PAGE_SIZE))
-    state: PageState = PageState.FREE     # 页面状态
-    access_time: float = 0.0              # 最后访问时间
-    load_time: float = 0.0                # 加载时间
-    access_count: int = 0                 # 访问计数（用于LFU）
-    is_pinned: bool = False               # 是否被钉住（不可置换）
+    __slots__ = ('page_id', 'block_id', 'owner_process', 'data', 'state',
+                 'access_time', 'load_time', 'access_count', 'is_pinned', 'data_preview')
+    
+    def __init__(self, page_id: int):
+        self.page_id = page_id                     # 缓冲页ID
+        self.block_id = -1                         # 对应的磁盘块号（-1表示未关联）
+        self.owner_process = -1                    # 所有者进程ID（-1表示无主）
+        self.data = bytearray(BUFFER_PAGE_SIZE)    # 页面数据，页面存续期间始终复用
+        self.state = PageState.FREE                # 页面状态
+        self.access_time = 0.0                     # 最后访问时间
+        self.load_time = 0.0                       # 加载时间
+        self.access_count = 0                      # 访问计数（用于LFU）
+        self.is_pinned = False                     # 是否被钉住（不可置换）
+        self.data_preview = ''                     # 数据前16字节的十六进制预览，数据变化时更新
     
     def reset(self):
-        """重置缓冲页"""
+        """重置缓冲页（数据区原地清零，页面存续期间始终复用同一个 bytearray）"""
         self.block_id = -1
         self.owner_process = -1
-        self.data = bytearray(BUFFER_PAGE_SIZE)
+        self.data[:] = _ZEROS
         self.state = PageState.FREE
         self.access_time = 0.0
         self.load_time = 0.0
         self.access_count = 0
         self.is_pinned = False
+        self.data_preview = ''
 
 
 class BufferManager:
     """
     缓冲区管理器
     管理M×K大小的内存缓冲区
-    实现缓冲页的分配、置换（LRU算法）和写回
+    实现缓冲页的分配、置换（2Q算法）和写回
+    脏页只在被置换、flush_all 或卸载前写回；文件系统的 iNode 与目录块不经过缓冲区，
+    异常退出时未写回的数据块会丢失，而引用它们的 iNode 已在磁盘上
     """
     
     def __init__(self, disk):
@@ -65,7 +77,8 @@ class BufferManager:
             disk: 虚拟磁盘对象
         """
         self.disk = disk
-        self.lock = threading.RLock()
+        # 非可重入锁：公开方法只加锁一次，内部统一调用 *_locked 版本（调用方已持锁）
+        self.lock = threading.Lock()
         self.condition = threading.Condition(self.lock)  # 条件变量，用于同步
         
         # 初始化缓冲页
@@ -76,6 +89,15 @@ class BufferManager:
         # 块号到页号的映射（用于快速查找）
         self.block_to_page: Dict[int, int] = {}
         
+        # 2Q 置换队列（块号 -> 页号，队首为最早进入的块）：
+        # a1in 为首次访问的试用队列（FIFO），再次命中后晋升到热队列 am；
+        # am 按时钟（二次机会）算法近似 LRU：命中只置访问位，不调整队列顺序；
+        # a1out 只记录最近被逐出试用队列的块号，再次缺页时直接装入 am
+        self.a1in: 'OrderedDict[int, int]' = OrderedDict()
+        self.am: 'OrderedDict[int, int]' = OrderedDict()
+        self.a1out: 'OrderedDict[int, None]' = OrderedDict()
+        self.ref_bits: List[bool] = [False] * BUFFER_PAGE_COUNT
+        
         # 统计信息
         self.stats = {
             'hits': 0,           # 缓存命中次数
@@ -86,31 +108,123 @@ class BufferManager:
         }
         
         # 置换日志（用于可视化）
-        self.swap_log: List[Dict] = []
+        self.swap_log: deque = deque(maxlen=50)  # 只保留最近50条日志
+        
+        # 可视化延时：开启后每次加载/写回页面模拟 PAGE_SWAP_DELAY 的换页耗时，
+        # 延时累计在线程本地，待最外层临界区释放锁之后才执行，不阻塞其他线程
+        self.visualize_delay = BUFFER_VISUALIZE_DELAY
+        self._local = threading.local()
+        
+        # 各状态的页数与钉住页数，随状态转换增量维护，统计时无需遍历所有页
+        self.state_counts: Dict[PageState, int] = {state: 0 for state in PageState}
+        self.state_counts[PageState.FREE] = BUFFER_PAGE_COUNT
+        self.pinned_count = 0
+        
+        # 状态版本号：缓冲区内容或页面元数据可能变化时自增，用于复用状态快照
+        self._version = 0
+        self._status_snapshot: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+    
+    @property
+    def version(self) -> int:
+        """状态版本号（只读），供调用方判断统计结果是否仍然有效"""
+        return self._version
+    
+    @contextmanager
+    def _critical(self):
+        """进入缓冲区临界区（不可嵌套）；退出并释放锁后执行累计的可视化延时"""
+        with self.condition:
+            self._version += 1
+            yield
+        local = self._local
+        delay = getattr(local, 'pending_delay', 0.0)
+        if delay:
+            local.pending_delay = 0.0
+            time.sleep(delay)
+    
+    def set_visualize_delay(self, enabled: bool):
+        """开启或关闭换页的可视化延时"""
+        with self.lock:
+            self.visualize_delay = enabled
+            self._version += 1
+    
+    def _simulate_swap_delay(self):
+        """记录一次换页的可视化延时（在锁外执行）"""
+        if self.visualize_delay:
+            local = self._local
+            local.pending_delay = getattr(local, 'pending_delay', 0.0) + PAGE_SWAP_DELAY
+    
+    def _set_state(self, page: BufferPage, state: PageState):
+        """切换页面状态并同步各状态的页数"""
+        counts = self.state_counts
+        counts[page.state] -= 1
+        counts[state] += 1
+        page.state = state
+    
+    def _reset_page(self, page: BufferPage):
+        """重置页面并同步计数"""
+        self._set_state(page, PageState.FREE)
+        if page.is_pinned:
+            self.pinned_count -= 1
+        self.ref_bits[page.page_id] = False
+        page.reset()
     
     def _find_free_page(self) -> Optional[int]:
         """查找空闲页"""
+        if not self.state_counts[PageState.FREE]:
+            return None
         for i, page in enumerate(self.pages):
             if page.state == PageState.FREE:
                 return i
         return None
     
-    def _find_victim_lru(self) -> Optional[int]:
+    def _first_unpinned(self, queue: 'OrderedDict[int, int]') -> Optional[int]:
+        """返回队列中从队首起第一个未钉住的页面"""
+        for page_id in queue.values():
+            if not self.pages[page_id].is_pinned:
+                return page_id
+        return None
+    
+    def _clock_victim(self) -> Optional[int]:
         """
-        使用LRU算法选择牺牲页
-        选择最近最少使用的未钉住页面
+        在热队列上运行时钟算法：从队首扫描，访问位为 1 的页清零后移到队尾（二次机会），
+        返回第一个访问位为 0 的未钉住页；扫描两圈仍未找到则说明全部被钉住
         """
-        victim = None
-        oldest_time = float('inf')
-        
-        for i, page in enumerate(self.pages):
-            if page.is_pinned:
-                continue
-            if page.state != PageState.FREE and page.access_time < oldest_time:
-                oldest_time = page.access_time
-                victim = i
+        am = self.am
+        ref_bits = self.ref_bits
+        pages = self.pages
+        for _ in range(2 * len(am)):
+            block_id, page_id = next(iter(am.items()))
+            if not pages[page_id].is_pinned and not ref_bits[page_id]:
+                return page_id
+            ref_bits[page_id] = False
+            am.move_to_end(block_id)
+        return None
+    
+    def _find_victim(self) -> Optional[int]:
+        """
+        使用2Q算法选择牺牲页
+        试用队列超过上限（或热队列无可置换页）时淘汰试用队列队首，否则按时钟算法淘汰热队列中的页；
+        只被访问过一次的顺序扫描块因此不会把热数据挤出缓冲区
+        """
+        if len(self.a1in) > BUFFER_A1IN_SIZE or not self.am:
+            victim = self._first_unpinned(self.a1in)
+            if victim is not None:
+                return victim
+            return self._clock_victim()
         
-        return victim
+        victim = self._clock_victim()
+        if victim is not None:
+            return victim
+        return self._first_unpinned(self.a1in)
+    
+    def _forget_block(self, block_id: int):
+        """从映射与置换队列中移除块；从试用队列逐出的块号记入 a1out"""
+        self.block_to_page.pop(block_id, None)
+        self.am.pop(block_id, None)
+        if self.a1in.pop(block_id, None) is not None:
+            self.a1out[block_id] = None
+            if len(self.a1out) > BUFFER_A1OUT_SIZE:
+                self.a1out.popitem(last=False)
     
     def _evict_page(self, page_id: int) -> bool:
         """
@@ -130,11 +244,10 @@ class BufferManager:
         self._log_swap('EVICT', page_id, page.block_id, page.owner_process)
         
         # 移除映射
-        if page.block_id in self.block_to_page:
-            del self.block_to_page[page.block_id]
+        self._forget_block(page.block_id)
         
         # 重置页面
-        page.reset()
+        self._reset_page(page)
         self.stats['evictions'] += 1
         
         return True
@@ -146,27 +259,29 @@ class BufferManager:
         if page.state != PageState.DIRTY or page.block_id < 0:
             return
         
-        # 写回磁盘
-        self.disk.write_block(page.block_id, bytes(page.data))
-        page.state = PageState.CLEAN
+        # 写回磁盘（直接从页面缓冲写出，不复制）
+        self.disk.write_block(page.block_id, memoryview(page.data))
+        self._set_state(page, PageState.CLEAN)
         
         self.stats['writebacks'] += 1
         self._log_swap('WRITEBACK', page_id, page.block_id, page.owner_process)
         
         # 模拟写回延时
-        time.sleep(PAGE_SWAP_DELAY)
+        self._simulate_swap_delay()
     
     def _load_page(self, page_id: int, block_id: int, process_id: int) -> bool:
         """从磁盘加载页面到缓冲区"""
         page = self.pages[page_id]
         
-        # 从磁盘读取数据
-        block_data = self.disk.read_block(block_id)
+        # 从磁盘直接读入页面缓冲（原地覆盖，不足一页的部分补零）
+        n = self.disk.read_block_into(block_id, page.data)
+        if n < BUFFER_PAGE_SIZE:
+            page.data[n:] = _ZEROS[n:]
+        page.data_preview = page.data[:16].hex()
         
         page.block_id = block_id
         page.owner_process = process_id
-        page.data = bytearray(block_data)
-        page.state = PageState.CLEAN
+        self._set_state(page, PageState.CLEAN)
         page.load_time = time.time()
         page.access_time = time.time()
         page.access_count = 1
@@ -178,7 +293,7 @@ class BufferManager:
         self._log_swap('LOAD', page_id, block_id, process_id)
         
         # 模拟加载延时
-        time.sleep(PAGE_SWAP_DELAY)
+        self._simulate_swap_delay()
         
         return True
     
@@ -194,34 +309,47 @@ class BufferManager:
         Returns:
             缓冲页ID，如果失败返回None
         """
-        with self.condition:
-            # 检查块是否已在缓冲区
-            if block_id in self.block_to_page:
-                page_id = self.block_to_page[block_id]
-                page = self.pages[page_id]
-                page.access_time = time.time()
-                page.access_count += 1
-                self.stats['hits'] += 1
-                return page_id
-            
-            self.stats['misses'] += 1
-            
-            # 查找空闲页
-            page_id = self._find_free_page()
-            
+        with self._critical():
+            return self._get_page_locked(block_id, process_id)
+    
+    def _get_page_locked(self, block_id: int, process_id: int) -> Optional[int]:
+        """get_page 的实现（调用方需持有锁）"""
+        # 检查块是否已在缓冲区
+        page_id = self.block_to_page.get(block_id)
+        if page_id is not None:
+            # 试用队列中的块再次命中即晋升为热页，热页只置访问位
+            if self.a1in.pop(block_id, None) is not None:
+                self.am[block_id] = page_id
+            else:
+                self.ref_bits[page_id] = True
+            page = self.pages[page_id]
+            page.access_time = time.time()
+            page.access_count += 1
+            self.stats['hits'] += 1
+            return page_id
+        
+        self.stats['misses'] += 1
+        
+        # 查找空闲页
+        page_id = self._find_free_page()
+        
+        if page_id is None:
+            # 需要置换
+            page_id = self._find_victim()
             if page_id is None:
-                # 需要置换
-                page_id = self._find_victim_lru()
-                if page_id is None:
-                    return None  # 所有页都被钉住
-                
-                self._evict_page(page_id)
-            
-            # 加载页面
-            if self._load_page(page_id, block_id, process_id):
-                return page_id
+                return None  # 所有页都被钉住
             
-            return None
+            self._evict_page(page_id)
+        
+        # 加载页面：最近刚被逐出试用队列的块直接进入热队列，否则进入试用队列
+        if self._load_page(page_id, block_id, process_id):
+            if self.a1out.pop(block_id, None) is not None:
+                self.am[block_id] = page_id
+            else:
+                self.a1in[block_id] = page_id
+            return page_id
+        
+        return None
     
     def read_page(self, block_id: int, process_id: int) -> Optional[bytes]:
         """
@@ -234,13 +362,51 @@ class BufferManager:
         Returns:
             块内容，如果失败返回None
         """
-        with self.condition:
-            page_id = self.get_page(block_id, process_id)
+        with self._critical():
+            page_id = self._get_page_locked(block_id, process_id)
             if page_id is None:
                 return None
             
             return bytes(self.pages[page_id].data)
     
+    def read_page_view(self, block_id: int, process_id: int) -> Optional[memoryview]:
+        """
+        读取指定磁盘块内容的只读视图（不复制）
+        视图直接指向缓冲页，页面被置换后内容会改变：
+        调用方须在下一次缓冲区操作之前用完，需要保留数据时请使用 read_page
+        
+        Args:
+            block_id: 磁盘块号
+            process_id: 请求的进程ID
+            
+        Returns:
+            块内容的只读视图，如果失败返回None
+        """
+        with self._critical():
+            page_id = self._get_page_locked(block_id, process_id)
+            if page_id is None:
+                return None
+            
+            data = self.pages[page_id].data
+            if self.visualize_delay:
+                # 可视化延时会在返回前于锁外执行，期间页面可能被置换，此时返回副本
+                data = bytes(data)
+            return memoryview(data).toreadonly()
+    
+    def peek_block(self, block_id: int) -> Optional[bytes]:
+        """
+        取得磁盘块在缓冲区中的内容（不装入页面、不改变置换队列与统计）
+        块的最新数据可能只在脏页中，直接查看磁盘块时应先查这里
+        
+        Returns:
+            块已缓冲时返回页面内容的副本，否则返回None
+        """
+        with self.lock:
+            page_id = self.block_to_page.get(block_id)
+            if page_id is None:
+                return None
+            return bytes(self.pages[page_id].data)
+    
     def write_page(self, block_id: int, data: bytes, process_id: int) -> bool:
         """
         写入数据到指定磁盘块（通过缓冲区）
@@ -253,32 +419,66 @@ class BufferManager:
         Returns:
             是否成功
         """
-        with self.condition:
-            page_id = self.get_page(block_id, process_id)
-            if page_id is None:
+        with self._critical():
+            if not self._write_page_locked(block_id, data, process_id):
                 return False
             
-            page = self.pages[page_id]
-            
-            # 写入数据
-            write_len = min(len(data), BUFFER_PAGE_SIZE)
-            page.data[:write_len] = data[:write_len]
-            if write_len < BUFFER_PAGE_SIZE:
-                page.data[write_len:] = b'\x00' * (BUFFER_PAGE_SIZE - write_len)
-            
-            page.state = PageState.DIRTY
-            page.access_time = time.time()
-            
             # 通知等待的线程
             self.condition.notify_all()
             
             return True
     
+    def write_pages_bulk(self, items: List[Tuple[int, bytes]], process_id: int) -> int:
+        """
+        批量写入多个磁盘块（通过缓冲区），整批只加锁、通知一次
+        
+        Args:
+            items: (磁盘块号, 数据) 列表，数据可以是 memoryview 切片
+            process_id: 请求的进程ID
+            
+        Returns:
+            成功写入的块数
+        """
+        with self._critical():
+            written = 0
+            for block_id, data in items:
+                if self._write_page_locked(block_id, data, process_id):
+                    written += 1
+            
+            if written:
+                self.condition.notify_all()
+            
+            return written
+    
+    def _write_page_locked(self, block_id: int, data: bytes, process_id: int) -> bool:
+        """将数据写入块对应的缓冲页并标记为脏页（调用方需持有锁）"""
+        page_id = self._get_page_locked(block_id, process_id)
+        if page_id is None:
+            return False
+        
+        page = self.pages[page_id]
+        
+        # 写入数据
+        write_len = min(len(data), BUFFER_PAGE_SIZE)
+        page.data[:write_len] = data[:write_len]
+        if write_len < BUFFER_PAGE_SIZE:
+            page.data[write_len:] = _ZEROS[write_len:]
+        page.data_preview = page.data[:16].hex()
+        
+        self._set_state(page, PageState.DIRTY)
+        page.access_time = time.time()
+        
+        return True
+    
     def pin_page(self, page_id: int) -> bool:
         """钉住页面（不可置换）"""
         with self.lock:
             if 0 <= page_id < BUFFER_PAGE_COUNT:
-                self.pages[page_id].is_pinned = True
+                page = self.pages[page_id]
+                if not page.is_pinned:
+                    page.is_pinned = True
+                    self.pinned_count += 1
+                    self._version += 1
                 return True
             return False
     
@@ -286,7 +486,11 @@ class BufferManager:
         """解除页面钉住状态"""
         with self.condition:
             if 0 <= page_id < BUFFER_PAGE_COUNT:
-                self.pages[page_id].is_pinned = False
+                page = self.pages[page_id]
+                if page.is_pinned:
+                    page.is_pinned = False
+                    self.pinned_count -= 1
+                    self._version += 1
                 # 通知等待的线程
                 self.condition.notify_all()
                 return True
@@ -294,7 +498,7 @@ class BufferManager:
     
     def flush_page(self, page_id: int) -> bool:
         """刷新指定页面（写回磁盘）"""
-        with self.lock:
+        with self._critical():
             if 0 <= page_id < BUFFER_PAGE_COUNT:
                 page = self.pages[page_id]
                 if page.state == PageState.DIRTY:
@@ -304,64 +508,102 @@ class BufferManager:
     
     def flush_all(self):
         """刷新所有脏页"""
-        with self.lock:
+        with self._critical():
             for i, page in enumerate(self.pages):
                 if page.state == PageState.DIRTY:
                     self._writeback_page(i)
     
+    def discard_block(self, block_id: int) -> bool:
+        """
+        丢弃磁盘块对应的缓冲页（不写回），用于块被释放时
+        
+        Returns:
+            该块是否在缓冲区中
+        """
+        with self.condition:
+            page_id = self.block_to_page.get(block_id)
+            # 块已释放，不再记录其访问历史
+            self.a1out.pop(block_id, None)
+            if page_id is None:
+                return False
+            
+            self.a1in.pop(block_id, None)
+            self.am.pop(block_id, None)
+            del self.block_to_page[block_id]
+            self._reset_page(self.pages[page_id])
+            self._version += 1
+            self.condition.notify_all()
+            return True
+    
     def release_process_pages(self, process_id: int):
         """释放指定进程的所有缓冲页"""
-        with self.condition:
+        with self._critical():
             for page in self.pages:
                 if page.owner_process == process_id:
                     if page.state == PageState.DIRTY:
                         self._writeback_page(page.page_id)
-                    page.reset()
-            
-            # 更新映射
-            self.block_to_page = {
-                b: p for b, p in self.block_to_page.items()
-                if self.pages[p].block_id == b
-            }
+                    # 重置前取出原块号，逐个移除映射与置换队列中的条目
+                    old_block = page.block_id
+                    self.block_to_page.pop(old_block, None)
+                    self.a1in.pop(old_block, None)
+                    self.am.pop(old_block, None)
+                    self._reset_page(page)
             
             self.condition.notify_all()
     
     def get_buffer_status(self) -> List[Dict[str, Any]]:
-        """获取缓冲区状态（用于可视化）"""
+        """
+        获取缓冲区状态（用于可视化）
+        缓冲区自上次调用以来未变化时直接返回同一份快照（调用方不应修改返回值）
+        """
         with self.lock:
-            status = []
-            for page in self.pages:
-                status.append({
-                    'page_id': page.page_id,
-                    'block_id': page.block_id,
-                    'owner': page.owner_process,
-                    'state': page.state.name,
-                    'is_pinned': page.is_pinned,
-                    'access_time': page.access_time,
-                    'access_count': page.access_count,
-                    'data_preview': page.data[:16].hex() if page.state != PageState.FREE else ''
-                })
-            return status
+            return self._buffer_status_locked()
+    
+    def _buffer_status_locked(self) -> List[Dict[str, Any]]:
+        """get_buffer_status 的实现（调用方需持有锁）"""
+        snapshot = self._status_snapshot
+        if snapshot is not None and snapshot[0] == self._version:
+            return snapshot[1]
+        
+        status = []
+        for page in self.pages:
+            status.append({
+                'page_id': page.page_id,
+                'block_id': page.block_id,
+                'owner': page.owner_process,
+                'state': page.state.name,
+                'is_pinned': page.is_pinned,
+                'access_time': page.access_time,
+                'access_count': page.access_count,
+                'data_preview': page.data_preview
+            })
+        self._status_snapshot = (self._version, status)
+        return status
     
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
         with self.lock:
-            total = self.stats['hits'] + self.stats['misses']
-            hit_rate = self.stats['hits'] / total if total > 0 else 0
-            
-            free_pages = sum(1 for p in self.pages if p.state == PageState.FREE)
-            dirty_pages = sum(1 for p in self.pages if p.state == PageState.DIRTY)
-            clean_pages = sum(1 for p in self.pages if p.state == PageState.CLEAN)
-            
-            return {
-                **self.stats,
-                'hit_rate': hit_rate,
-                'total_pages': BUFFER_PAGE_COUNT,
-                'free_pages': free_pages,
-                'dirty_pages': dirty_pages,
-                'clean_pages': clean_pages,
-                'pinned_pages': sum(1 for p in self.pages if p.is_pinned)
-            }
+            return self._stats_locked()
+    
+    def _stats_locked(self) -> Dict[str, Any]:
+        """get_stats 的实现（调用方需持有锁）"""
+        total = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / total if total > 0 else 0
+        
+        counts = self.state_counts
+        return {
+            **self.stats,
+            'hit_rate': hit_rate,
+            'total_pages': BUFFER_PAGE_COUNT,
+            'free_pages': counts[PageState.FREE],
+            'dirty_pages': counts[PageState.DIRTY],
+            'clean_pages': counts[PageState.CLEAN],
+            'pinned_pages': self.pinned_count,
+            'a1in_pages': len(self.a1in),
+            'am_pages': len(self.am),
+            'a1out_blocks': len(self.a1out),
+            'visualize_delay': self.visualize_delay
+        }
     
     def _log_swap(self, op_type: str, page_id: int, block_id: int, process_id: int):
         """记录置换日志"""
@@ -373,16 +615,13 @@ class BufferManager:
             'process_id': process_id
         }
         self.swap_log.append(log_entry)
-        # 只保留最近50条日志
-        if len(self.swap_log) > 50:
-            self.swap_log = self.swap_log[-50:]
     
     def get_swap_log(self) -> List[Dict]:
         """获取置换日志"""
-        return self.swap_log.copy()
+        return list(self.swap_log)
 
     def access_block(self, block_id: int, process_id: int = 0) -> Dict[str, Any]:
-        """访问单个磁盘块；若不在缓冲中会触发置换（LRU）。"""
+        """访问单个磁盘块；若不在缓冲中会触发置换（2Q）。"""
         before_hit = block_id in self.block_to_page
         data = self.read_page(block_id, process_id)
         success = data is not None
@@ -399,21 +638,21 @@ class BufferManager:
 
     def rewrite_block(self, block_id: int, process_id: int = 0) -> Dict[str, Any]:
         """在内存中重写块的原有内容，用于模拟写操作但不改变数据。"""
-        with self.condition:
+        with self._critical():
             before_hit = block_id in self.block_to_page
-            page_id = self.get_page(block_id, process_id)
+            page_id = self._get_page_locked(block_id, process_id)
             if page_id is None:
                 return {
                     'success': False,
                     'error': '无法加载块到缓冲区',
-                    'stats': self.get_stats(),
+                    'stats': self._stats_locked(),
                     'log': self.get_swap_log(),
-                    'pages': self.get_buffer_status(),
+                    'pages': self._buffer_status_locked(),
                 }
 
             page = self.pages[page_id]
             # 不改变数据内容，仅标记为写入过（脏页）
-            page.state = PageState.DIRTY
+            self._set_state(page, PageState.DIRTY)
             page.access_time = time.time()
             page.access_count += 1
             self._log_swap('WRITE', page_id, block_id, process_id)
@@ -423,9 +662,9 @@ class BufferManager:
                 'hit': before_hit,
                 'block_id': block_id,
                 'page_id': page_id,
-                'stats': self.get_stats(),
+                'stats': self._stats_locked(),
                 'log': self.get_swap_log(),
-                'pages': self.get_buffer_status(),
+                'pages': self._buffer_status_locked(),
             }
     
     def wait_for_page(self, block_id: int, process_id: int, timeout: float = None) -> Optional[int]:
@@ -441,11 +680,11 @@ class BufferManager:
         Returns:
             缓冲页ID，超时返回None
         """
-        with self.condition:
+        with self._critical():
             start_time = time.time()
             
             while True:
-                page_id = self.get_page(block_id, process_id)
+                page_id = self._get_page_locked(block_id, process_id)
                 if page_id is not None:
                     return page_id
                 
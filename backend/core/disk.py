@@ -4,14 +4,56 @@
 实现M×N大小的模拟磁盘，采用位图+索引方式管理
 """
 
+import mmap
 import os
 import struct
 import threading
 import time
+from collections import deque
 from typing import List, Optional, Tuple
+import numpy as np
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
+from .inode_decode import INODE_HEAD
+
+# 超级块布局（小端序）：魔数、版本号、块大小、总块数、空闲块数、数据区起始块、iNode数量、创建时间
+_SUPERBLOCK = struct.Struct('<IHHIIIIQ')
+_DISK_MAGIC = 0x4F534653  # 'OSFS'
+_DISK_MAGIC_BYTES = _DISK_MAGIC.to_bytes(4, 'little')  # 魔数在磁盘上的字节形式 b'SFSO'
+
+# 整块大小的全零缓冲：清零或补零时切片其 memoryview，不会每次分配新的零字节串
+_ZERO_BLOCK = memoryview(bytes(BLOCK_SIZE))
+
+# 位图按64位字扫描：每个字覆盖64个块（小端序，字内第 j 位对应块 字序号*64+j）
+_WORD_BITS = 64
+_WORD_BYTES = _WORD_BITS // 8
+_WORD_MASK = (1 << _WORD_BITS) - 1
+# 批量分配的块数达到该值时改用 NumPy 整体扫描与置位，低于该值时逐字扫描更快
+_BULK_ALLOC_THRESHOLD = 32
+
+# 数据区各块在整张位图（视为小端大整数）中对应的位
+_DATA_AREA_MASK = ((1 << BLOCK_COUNT) - 1) ^ ((1 << DATA_START_BLOCK) - 1)
+
+# 置位计数：int.bit_count 需要 Python 3.10，更早的版本退化为统计二进制串中的 '1'
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+class _LogEntry:
+    """操作日志条目（使用 __slots__，日志环中每条只占固定的三个字段）"""
+    __slots__ = ('timestamp', 'type', 'message')
+    
+    def __init__(self, timestamp: float, op_type: str, message: str):
+        self.timestamp = timestamp
+        self.type = op_type
+        self.message = message
+    
+    def to_dict(self) -> dict:
+        return {'timestamp': self.timestamp, 'type': self.type, 'message': self.message}
 
 
 class VirtualDisk:
@@ -34,15 +76,30 @@ class VirtualDisk:
         self.is_mounted = False
         self.total_blocks = BLOCK_COUNT
         self.free_blocks = 0
+        # 版本号：空闲块数或挂载状态变化时自增，供调用方判断磁盘信息是否仍然有效
+        self.version = 0
         
         # 位图缓存（内存中的位图副本）
         self.bitmap = bytearray(BLOCK_COUNT // 8)  # 1024位 = 128字节
+        # 内存位图中已修改、尚未写回磁盘的字节区间 [lo, hi)，lo >= hi 表示没有待写回的修改
+        self._bitmap_dirty_lo = len(self.bitmap)
+        self._bitmap_dirty_hi = 0
+        # 分配游标：保证该块号之前没有空闲块，分配时从这里开始查找
+        self._alloc_cursor = DATA_START_BLOCK
         
         # 操作记录（用于可视化）
-        self.operation_log = []
+        self.operation_log: deque = deque(maxlen=100)  # 只保留最近100条日志
+        
+        # 磁盘文件在挂载期间保持打开并整体映射到内存，块读写直接作用于映射区
+        exists = os.path.exists(self.disk_path)
+        self._fd = os.open(self.disk_path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+        self._mm: Optional[mmap.mmap] = None
+        self._map_file()
+        # 映射区中已修改、尚未同步到磁盘文件的页（按 mmap 刷新粒度划分）
+        self._dirty_pages: set = set()
         
         # 初始化或加载磁盘
-        if os.path.exists(self.disk_path):
+        if exists:
             self._load_disk()
         else:
             self._format_disk()
@@ -50,9 +107,8 @@ class VirtualDisk:
     def _format_disk(self):
         """格式化磁盘，初始化所有数据结构"""
         with self.lock:
-            # 创建空磁盘文件
-            with open(self.disk_path, 'wb') as f:
-                f.write(b'\x00' * DISK_SIZE)
+            # 清空磁盘
+            self._map_file(reset=True)
             
             # 初始化超级块
             self._write_superblock()
@@ -66,14 +122,25 @@ class VirtualDisk:
             self.is_mounted = True
             self._log_operation("FORMAT", "磁盘格式化完成")
     
+    def _map_file(self, reset: bool = False):
+        """
+        将磁盘文件映射到内存
+        文件不足 DISK_SIZE 时用 ftruncate 扩展（映射区不能超出文件末尾），扩展部分读出为0；
+        reset 为真时先截断为空再扩展，无需在用户态写入整盘的0即可得到空白磁盘
+        """
+        if self._mm is not None:
+            self._mm.close()
+        if reset:
+            os.ftruncate(self._fd, 0)
+        if os.fstat(self._fd).st_size < DISK_SIZE:
+            os.ftruncate(self._fd, DISK_SIZE)
+        self._mm = mmap.mmap(self._fd, DISK_SIZE)
+    
     def _load_disk(self):
         """加载已存在的磁盘"""
         with self.lock:
-            # 读取超级块验证
-            superblock = self._read_block(0)
-            magic = struct.unpack('<I', superblock[:4])[0]
-            
-            if magic != 0x4F534653:  # 'OSFS' magic number
+            # 验证超级块魔数：直接比较开头4字节，无需解析整个超级块
+            if self._mm[:4] != _DISK_MAGIC_BYTES:
                 self._format_disk()
                 return
             
@@ -85,34 +152,31 @@ class VirtualDisk:
     def _write_superblock(self):
         """写入超级块信息"""
         superblock = bytearray(BLOCK_SIZE)
-        
-        # Magic Number: 'OSFS'
-        struct.pack_into('<I', superblock, 0, 0x4F534653)
-        # 版本号
-        struct.pack_into('<H', superblock, 4, 1)
-        # 块大小
-        struct.pack_into('<H', superblock, 6, BLOCK_SIZE)
-        # 总块数
-        struct.pack_into('<I', superblock, 8, BLOCK_COUNT)
-        # 空闲块数
-        struct.pack_into('<I', superblock, 12, BLOCK_COUNT - DATA_START_BLOCK)
-        # 数据区起始块
-        struct.pack_into('<I', superblock, 16, DATA_START_BLOCK)
-        # iNode数量
-        struct.pack_into('<I', superblock, 20, MAX_INODES)
-        # 创建时间
-        struct.pack_into('<Q', superblock, 24, int(time.time()))
-        
-        self._write_block(0, bytes(superblock))
+        _SUPERBLOCK.pack_into(
+            superblock, 0,
+            _DISK_MAGIC,                          # Magic Number: 'OSFS'
+            1,                                    # 版本号
+            BLOCK_SIZE,                           # 块大小
+            BLOCK_COUNT,                          # 总块数
+            BLOCK_COUNT - DATA_START_BLOCK,       # 空闲块数
+            DATA_START_BLOCK,                     # 数据区起始块
+            MAX_INODES,                           # iNode数量
+            int(time.time())                      # 创建时间
+        )
+        self._write_block(0, superblock)
     
     def _init_bitmap(self):
         """初始化位图"""
-        # 标记元数据区块为已使用
-        for i in range(DATA_START_BLOCK):
-            self._set_bit(i, True)
+        # 标记元数据区块为已使用：整字节一次填满，剩余的几位单独置位
+        full_bytes, rem = divmod(DATA_START_BLOCK, 8)
+        self.bitmap[:full_bytes] = b'\xff' * full_bytes
+        if rem:
+            self.bitmap[full_bytes] |= (1 << rem) - 1
         
         # 计算空闲块数
         self.free_blocks = BLOCK_COUNT - DATA_START_BLOCK
+        self._alloc_cursor = DATA_START_BLOCK
+        self.version += 1
         
         # 写入位图到磁盘
         self._save_bitmap()
@@ -124,10 +188,10 @@ class VirtualDisk:
         if root_block is None:
             root_block = DATA_START_BLOCK  # 备用：直接使用数据区第一块
             self._set_bit(root_block, True)
-            self._save_bitmap()
+            self._flush_bitmap()
         
         # 初始化根目录数据块（空目录）
-        self._write_block(root_block, b'\x00' * BLOCK_SIZE)
+        self._write_block(root_block, _ZERO_BLOCK)
         
         # 创建根目录的iNode（iNode 0），包含一个数据块
         root_inode = self._create_inode(
@@ -161,17 +225,11 @@ class VirtualDisk:
         
         current_time = int(time.time())
         
-        struct.pack_into('<H', inode, 0, inode_id)
-        struct.pack_into('<B', inode, 2, file_type)
-        struct.pack_into('<B', inode, 3, permissions)
-        struct.pack_into('<I', inode, 4, size)
-        struct.pack_into('<Q', inode, 8, current_time)
-        struct.pack_into('<Q', inode, 16, current_time)
-        struct.pack_into('<H', inode, 24, 1)  # 链接计数
-        
-        # 写入直接索引块
-        for i, block_id in enumerate(blocks[:DIRECT_BLOCKS]):
-            struct.pack_into('<H', inode, 26 + i * 2, block_id)
+        # 直接索引块不足的部分补0，间接索引为空
+        direct = list(blocks[:DIRECT_BLOCKS]) + [0] * (DIRECT_BLOCKS - len(blocks[:DIRECT_BLOCKS]))
+        INODE_HEAD.pack_into(inode, 0, inode_id, file_type, permissions, size,
+                             current_time, current_time, 1,  # 链接计数为1
+                             *direct, 0, 0)
         
         return bytes(inode)
     
@@ -180,25 +238,43 @@ class VirtualDisk:
         if block_id < 0 or block_id >= BLOCK_COUNT:
             raise ValueError(f"无效的块号: {block_id}")
         
-        with open(self.disk_path, 'rb') as f:
-            f.seek(block_id * BLOCK_SIZE)
-            data = f.read(BLOCK_SIZE)
+        offset = block_id * BLOCK_SIZE
+        return self._mm[offset:offset + BLOCK_SIZE]
+    
+    def _read_block_view(self, block_id: int) -> memoryview:
+        """返回指定块在映射区中的只读视图（不复制）"""
+        if block_id < 0 or block_id >= BLOCK_COUNT:
+            raise ValueError(f"无效的块号: {block_id}")
         
-        return data
+        offset = block_id * BLOCK_SIZE
+        return memoryview(self._mm)[offset:offset + BLOCK_SIZE].toreadonly()
     
-    def _write_block(self, block_id: int, data: bytes):
-        """写入指定块"""
+    def _read_block_into(self, block_id: int, buffer) -> int:
+        """将指定块直接读入调用方提供的可写缓冲区（至多 BLOCK_SIZE 字节），返回读取的字节数"""
         if block_id < 0 or block_id >= BLOCK_COUNT:
             raise ValueError(f"无效的块号: {block_id}")
         
-        if len(data) > BLOCK_SIZE:
-            data = data[:BLOCK_SIZE]
-        elif len(data) < BLOCK_SIZE:
-            data = data + b'\x00' * (BLOCK_SIZE - len(data))
+        offset = block_id * BLOCK_SIZE
+        target = memoryview(buffer)[:BLOCK_SIZE]
+        n = len(target)
+        target[:] = memoryview(self._mm)[offset:offset + n]
+        return n
+    
+    def _write_block(self, block_id: int, data: bytes):
+        """写入指定块（data 可以是任意支持缓冲区协议的对象，如 memoryview）"""
+        if block_id < 0 or block_id >= BLOCK_COUNT:
+            raise ValueError(f"无效的块号: {block_id}")
         
-        with open(self.disk_path, 'r+b') as f:
-            f.seek(block_id * BLOCK_SIZE)
-            f.write(data)
+        offset = block_id * BLOCK_SIZE
+        n = len(data)
+        if n >= BLOCK_SIZE:
+            self._mm[offset:offset + BLOCK_SIZE] = data[:BLOCK_SIZE] if n > BLOCK_SIZE else data
+        else:
+            # 不足一块的部分直接在映射区补零
+            self._mm[offset:offset + n] = data
+            self._mm[offset + n:offset + BLOCK_SIZE] = _ZERO_BLOCK[n:]
+        # 先写数据再标记脏页，保证并发的同步不会漏掉这次写入
+        self._dirty_pages.add(offset // mmap.ALLOCATIONGRANULARITY)
     
     def _set_bit(self, block_id: int, used: bool):
         """设置位图中的某一位"""
@@ -209,6 +285,19 @@ class VirtualDisk:
             self.bitmap[byte_index] |= (1 << bit_index)
         else:
             self.bitmap[byte_index] &= ~(1 << bit_index)
+        self._mark_bitmap_dirty(byte_index, byte_index + 1)
+    
+    def _mark_bitmap_dirty(self, lo: int, hi: int):
+        """把位图字节区间 [lo, hi) 并入待写回区间"""
+        if lo < self._bitmap_dirty_lo:
+            self._bitmap_dirty_lo = lo
+        if hi > self._bitmap_dirty_hi:
+            self._bitmap_dirty_hi = hi
+    
+    def _clear_bitmap_dirty(self):
+        """位图已与磁盘一致，清空待写回区间"""
+        self._bitmap_dirty_lo = len(self.bitmap)
+        self._bitmap_dirty_hi = 0
     
     def _get_bit(self, block_id: int) -> bool:
         """获取位图中某一位的状态"""
@@ -219,25 +308,112 @@ class VirtualDisk:
     def _save_bitmap(self):
         """保存位图到磁盘"""
         # 位图从块1开始存储
+        # 位图不足整块的部分由 _write_block 补零
         for i in range(BITMAP_BLOCKS):
             start = i * BLOCK_SIZE
-            end = start + BLOCK_SIZE
-            block_data = bytes(self.bitmap[start:end]) if end <= len(self.bitmap) else \
-                         bytes(self.bitmap[start:]) + b'\x00' * (BLOCK_SIZE - len(self.bitmap[start:]))
-            self._write_block(SUPERBLOCK_BLOCKS + i, block_data)
+            self._write_block(SUPERBLOCK_BLOCKS + i, self.bitmap[start:start + BLOCK_SIZE])
+        self._clear_bitmap_dirty()
+    
+    def _flush_bitmap(self):
+        """只把修改过的位图字节写回磁盘：位图区在磁盘上连续，整个待写回区间一次写入映射区"""
+        lo, hi = self._bitmap_dirty_lo, self._bitmap_dirty_hi
+        if lo >= hi:
+            return
+        offset = SUPERBLOCK_BLOCKS * BLOCK_SIZE + lo
+        self._mm[offset:offset + (hi - lo)] = self.bitmap[lo:hi]
+        for page in range(offset // mmap.ALLOCATIONGRANULARITY,
+                          (offset + hi - lo - 1) // mmap.ALLOCATIONGRANULARITY + 1):
+            self._dirty_pages.add(page)
+        self._clear_bitmap_dirty()
     
     def _load_bitmap(self):
         """从磁盘加载位图"""
-        bitmap_data = bytearray()
-        for i in range(BITMAP_BLOCKS):
-            block_data = self._read_block(SUPERBLOCK_BLOCKS + i)
-            bitmap_data.extend(block_data)
-        
-        self.bitmap = bitmap_data[:BLOCK_COUNT // 8]
+        # 位图块在磁盘上连续存放，从映射区一次复制出整张位图
+        start = SUPERBLOCK_BLOCKS * BLOCK_SIZE
+        with memoryview(self._mm) as view:
+            self.bitmap = bytearray(view[start:start + BLOCK_COUNT // 8])
+        self._clear_bitmap_dirty()
         
-        # 计算空闲块数
-        self.free_blocks = sum(1 for i in range(DATA_START_BLOCK, BLOCK_COUNT) 
-                               if not self._get_bit(i))
+        # 计算空闲块数：对数据区的位整体做一次置位计数
+        used = _popcount(int.from_bytes(self.bitmap, 'little') & _DATA_AREA_MASK)
+        self.free_blocks = (BLOCK_COUNT - DATA_START_BLOCK) - used
+        self._alloc_cursor = DATA_START_BLOCK
+        self.version += 1
+    
+    def _allocate_block(self) -> Optional[int]:
+        """分配一个空闲块（调用方需持有锁，位图修改由调用方写回）"""
+        found = self._find_free_bits(1)
+        if not found:
+            return None
+        block_id = found[0]
+        self._alloc_cursor = block_id + 1
+        self._set_bit(block_id, True)
+        self.free_blocks -= 1
+        self.version += 1
+        self._log_operation("ALLOCATE", f"分配块 {block_id}")
+        return block_id
+    
+    def _free_block(self, block_id: int):
+        """释放一个块（调用方需持有锁，位图修改由调用方写回）"""
+        if block_id >= DATA_START_BLOCK and self._get_bit(block_id):
+            self._set_bit(block_id, False)
+            self._alloc_cursor = min(self._alloc_cursor, block_id)
+            self.free_blocks += 1
+            self.version += 1
+            # 清空块内容
+            self._write_block(block_id, _ZERO_BLOCK)
+            self._log_operation("FREE", f"释放块 {block_id}")
+    
+    def _find_free_bits(self, count: int) -> List[int]:
+        """从分配游标处按64位字扫描位图，返回数据区中最靠前的至多 count 个空闲块号"""
+        found = []
+        bitmap = self.bitmap
+        cursor = self._alloc_cursor
+        first_word = cursor // _WORD_BITS
+        for word_index in range(first_word, (BLOCK_COUNT + _WORD_BITS - 1) // _WORD_BITS):
+            start = word_index * _WORD_BYTES
+            free = ~int.from_bytes(bitmap[start:start + _WORD_BYTES], 'little') & _WORD_MASK
+            if not free:
+                continue  # 整个字都已分配
+            if word_index == first_word:
+                free &= _WORD_MASK << (cursor % _WORD_BITS)  # 跳过游标之前的块
+            while free:
+                low = free & -free
+                block_id = word_index * _WORD_BITS + low.bit_length() - 1
+                if block_id >= BLOCK_COUNT:
+                    return found
+                found.append(block_id)
+                if len(found) == count:
+                    return found
+                free ^= low
+        return found
+    
+    def _find_free_bits_bulk(self, count: int) -> np.ndarray:
+        """用 NumPy 一次展开位图，返回游标之后最靠前的至多 count 个空闲块号"""
+        bits = np.unpackbits(np.frombuffer(self.bitmap, dtype=np.uint8), bitorder='little')
+        cursor = self._alloc_cursor
+        return np.flatnonzero(bits[cursor:BLOCK_COUNT] == 0)[:count] + cursor
+    
+    def _set_bits_used_bulk(self, blocks: np.ndarray):
+        """将一批块在位图中整体标记为已使用（调用方需持有锁）"""
+        byte_index = blocks >> 3
+        view = np.frombuffer(self.bitmap, dtype=np.uint8)
+        np.bitwise_or.at(view, byte_index, np.left_shift(1, blocks & 7).astype(np.uint8))
+        self._mark_bitmap_dirty(int(byte_index.min()), int(byte_index.max()) + 1)
+    
+    def _set_bits_used(self, blocks: List[int]):
+        """将一批块在位图中标记为已使用（按字合并后一次写入，调用方需持有锁）"""
+        masks = {}
+        for block_id in blocks:
+            word_index = block_id // _WORD_BITS
+            masks[word_index] = masks.get(word_index, 0) | (1 << (block_id % _WORD_BITS))
+        bitmap = self.bitmap
+        for word_index, mask in masks.items():
+            start = word_index * _WORD_BYTES
+            chunk = bitmap[start:start + _WORD_BYTES]
+            word = int.from_bytes(chunk, 'little') | mask
+            bitmap[start:start + len(chunk)] = word.to_bytes(len(chunk), 'little')
+            self._mark_bitmap_dirty(start, start + len(chunk))
     
     def allocate_block(self) -> Optional[int]:
         """
@@ -246,81 +422,124 @@ class VirtualDisk:
         返回块号，如果没有空闲块则返回None
         """
         with self.lock:
-            for i in range(DATA_START_BLOCK, BLOCK_COUNT):
-                if not self._get_bit(i):
-                    self._set_bit(i, True)
-                    self.free_blocks -= 1
-                    self._save_bitmap()
-                    self._log_operation("ALLOCATE", f"分配块 {i}")
-                    return i
-            return None
+            block = self._allocate_block()
+            self._flush_bitmap()
+            return block
     
     def allocate_blocks(self, count: int) -> List[int]:
-        """分配多个连续或非连续的空闲块"""
+        """
+        分配多个连续或非连续的空闲块
+        一次扫描找齐所需的空闲块，空闲块不足时不分配任何块；位图只写回一次
+        """
+        if count <= 0:
+            return []
         with self.lock:
-            blocks = []
-            for _ in range(count):
-                block = self.allocate_block()
-                if block is None:
-                    # 回滚已分配的块
-                    for b in blocks:
-                        self.free_block(b)
+            if count == 1:
+                block = self._allocate_block()
+                self._flush_bitmap()
+                return [block] if block is not None else []
+            
+            if count >= _BULK_ALLOC_THRESHOLD:
+                found = self._find_free_bits_bulk(count)
+                if len(found) < count:
+                    return []
+                self._set_bits_used_bulk(found)
+                blocks = found.tolist()
+            else:
+                blocks = self._find_free_bits(count)
+                if len(blocks) < count:
                     return []
-                blocks.append(block)
+                self._set_bits_used(blocks)
+            self._alloc_cursor = blocks[-1] + 1
+            self.free_blocks -= count
+            self.version += 1
+            for block_id in blocks:
+                self._log_operation("ALLOCATE", f"分配块 {block_id}")
+            self._flush_bitmap()
             return blocks
     
     def free_block(self, block_id: int):
         """释放一个块"""
         with self.lock:
-            if block_id >= DATA_START_BLOCK and self._get_bit(block_id):
-                self._set_bit(block_id, False)
-                self.free_blocks += 1
-                self._save_bitmap()
-                # 清空块内容
-                self._write_block(block_id, b'\x00' * BLOCK_SIZE)
-                self._log_operation("FREE", f"释放块 {block_id}")
+            self._free_block(block_id)
+            self._flush_bitmap()
+    
+    # 块与 iNode 的读写直接访问映射区，不同块之间互不影响，不持 self.lock；
+    # self.lock 只保护位图、计数与日志等共享状态。
+    # 本类不会阻止 close() 与块读写并发：调用方须保证关闭前没有进行中的读写、也没有未释放的
+    # read_block_view 视图（否则读写会因映射区已关闭而失败，关闭本身会抛出 BufferError）。
+    # app 中读写磁盘的处理器与接口都在 state_rwlock 读锁内执行，格式化持写锁后才调用 close()
     
     def read_block(self, block_id: int) -> bytes:
-        """公开的读块接口（带锁）"""
+        """公开的读块接口"""
+        data = self._read_block(block_id)
+        with self.lock:
+            self._log_operation("READ", f"读取块 {block_id}")
+        return data
+    
+    def read_block_view(self, block_id: int) -> memoryview:
+        """
+        公开的读块接口：返回映射区的只读视图，不产生副本
+        视图随磁盘内容变化，调用方应立即使用（如复制为 bytearray 后修改），不要长期持有；
+        磁盘卸载前所有视图必须已释放
+        """
+        view = self._read_block_view(block_id)
         with self.lock:
-            data = self._read_block(block_id)
             self._log_operation("READ", f"读取块 {block_id}")
-            return data
+        return view
+    
+    def read_block_into(self, block_id: int, buffer) -> int:
+        """公开的读块接口：直接读入调用方的缓冲区，不产生中间 bytes"""
+        n = self._read_block_into(block_id, buffer)
+        with self.lock:
+            self._log_operation("READ", f"读取块 {block_id}")
+        return n
     
     def write_block(self, block_id: int, data: bytes):
-        """公开的写块接口（带锁）"""
+        """公开的写块接口"""
+        self._write_block(block_id, data)
         with self.lock:
-            self._write_block(block_id, data)
             self._log_operation("WRITE", f"写入块 {block_id}")
     
-    def _write_inode(self, inode_id: int, inode_data: bytes):
-        """写入iNode"""
+    @staticmethod
+    def _inode_offset(inode_id: int) -> int:
+        """iNode 在磁盘文件中的字节偏移"""
         block_id = SUPERBLOCK_BLOCKS + BITMAP_BLOCKS + (inode_id // INODES_PER_BLOCK)
-        offset = (inode_id % INODES_PER_BLOCK) * INODE_SIZE
-        
-        block_data = bytearray(self._read_block(block_id))
-        block_data[offset:offset + INODE_SIZE] = inode_data
-        self._write_block(block_id, bytes(block_data))
+        return block_id * BLOCK_SIZE + (inode_id % INODES_PER_BLOCK) * INODE_SIZE
+    
+    def _write_inode(self, inode_id: int, inode_data: bytes):
+        """写入iNode（直接覆盖映射区中对应的字节，无需读出整块再写回）"""
+        assert len(inode_data) == INODE_SIZE, f"iNode 数据长度应为 {INODE_SIZE} 字节"
+        offset = self._inode_offset(inode_id)
+        self._mm[offset:offset + INODE_SIZE] = inode_data
+        self._dirty_pages.add(offset // mmap.ALLOCATIONGRANULARITY)
     
     def read_inode(self, inode_id: int) -> bytes:
         """读取iNode"""
-        with self.lock:
-            block_id = SUPERBLOCK_BLOCKS + BITMAP_BLOCKS + (inode_id // INODES_PER_BLOCK)
-            offset = (inode_id % INODES_PER_BLOCK) * INODE_SIZE
-            
-            block_data = self._read_block(block_id)
-            return block_data[offset:offset + INODE_SIZE]
+        offset = self._inode_offset(inode_id)
+        return self._mm[offset:offset + INODE_SIZE]
+    
+    def read_inode_table(self) -> bytes:
+        """一次读取整个iNode区（MAX_INODES 个 iNode 连续存放）"""
+        offset = (SUPERBLOCK_BLOCKS + BITMAP_BLOCKS) * BLOCK_SIZE
+        return self._mm[offset:offset + MAX_INODES * INODE_SIZE]
     
     def write_inode(self, inode_id: int, inode_data: bytes):
         """公开的写iNode接口"""
+        self._write_inode(inode_id, inode_data)
         with self.lock:
-            self._write_inode(inode_id, inode_data)
             self._log_operation("WRITE_INODE", f"写入iNode {inode_id}")
     
     def get_bitmap_status(self) -> List[bool]:
-        """获取位图状态（用于可视化）"""
+        """获取位图状态（用于可视化），块 i 对应第 i//8 字节的第 i%8 位"""
+        with self.lock:
+            bits = np.unpackbits(np.frombuffer(self.bitmap, dtype=np.uint8), bitorder='little')
+        return bits[:BLOCK_COUNT].astype(bool).tolist()
+    
+    def get_bitmap_raw(self) -> bytes:
+        """获取位图原始字节（每字节8位，低位对应小块号）"""
         with self.lock:
-            return [self._get_bit(i) for i in range(BLOCK_COUNT)]
+            return bytes(self.bitmap)
     
     def get_disk_info(self) -> dict:
         """获取磁盘信息"""
@@ -335,19 +554,47 @@ class VirtualDisk:
                 'is_mounted': self.is_mounted
             }
     
+    def _sync(self):
+        """将映射区中修改过的页同步到磁盘文件（相邻的页合并为一次刷新，调用方需持有锁）"""
+        if not self._dirty_pages:
+            return
+        granularity = mmap.ALLOCATIONGRANULARITY
+        # 先换出脏页集合再刷新，刷新期间的并发写入记到新集合中，留待下次同步
+        dirty, self._dirty_pages = self._dirty_pages, set()
+        pages = sorted(dirty)
+        run_start = prev = pages[0]
+        for page in pages[1:] + [None]:
+            if page is not None and page == prev + 1:
+                prev = page
+                continue
+            start = run_start * granularity
+            self._mm.flush(start, min((prev + 1) * granularity, DISK_SIZE) - start)
+            if page is not None:
+                run_start = prev = page
+    
+    def sync(self):
+        """将已写入的块持久化到磁盘文件"""
+        with self.lock:
+            if self._fd >= 0:
+                self._sync()
+                self._log_operation("SYNC", "磁盘数据已同步")
+    
+    def close(self):
+        """卸载磁盘：将映射区刷回磁盘文件后关闭（调用方须保证此时没有进行中的块读写，见上文）"""
+        with self.lock:
+            if self._fd >= 0:
+                self._sync()
+                self._mm.close()
+                os.close(self._fd)
+                self._fd = -1
+            self.is_mounted = False
+            self.version += 1
+    
     def _log_operation(self, op_type: str, message: str):
         """记录操作日志"""
-        log_entry = {
-            'timestamp': time.time(),
-            'type': op_type,
-            'message': message
-        }
-        self.operation_log.append(log_entry)
-        # 只保留最近100条日志
-        if len(self.operation_log) > 100:
-            self.operation_log = self.operation_log[-100:]
+        self.operation_log.append(_LogEntry(time.time(), op_type, message))
     
     def get_operation_log(self) -> List[dict]:
         """获取操作日志"""
-        return self.operation_log.copy()
+        return [entry.to_dict() for entry in self.operation_log]
 
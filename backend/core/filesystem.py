@@ -5,17 +5,25 @@
 采用索引方式组织数据
 """
 
+import heapq
 import os
 import struct
 import threading
 import time
+from functools import wraps
 from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
+import numpy as np
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
 from .disk import VirtualDisk
+from .inode_cache import InodeCache
+from .inode_decode import INODE_HEAD
+
+# 目录项布局：24字节文件名（不足补\0）+ 2字节 iNode 号
+_DIRENTRY = struct.Struct('<24sH')
 
 # 全局进度回调（用于可视化）
 _progress_callback = None
@@ -38,6 +46,20 @@ def notify_progress(operation: str, filename: str, current_block: int, total_blo
             'progress': (current_block / total_blocks * 100) if total_blocks > 0 else 100
         })
 
+def _settle_io_delay(method):
+    """文件操作返回（已释放 self.lock）后一次性执行本次操作累计的 I/O 延时"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            local = self._local
+            delay = getattr(local, 'pending_delay', 0.0)
+            if delay:
+                local.pending_delay = 0.0
+                time.sleep(delay)
+    return wrapper
+
 
 class FileType(Enum):
     """文件类型枚举"""
@@ -62,54 +84,33 @@ class INode:
     
     @classmethod
     def from_bytes(cls, data: bytes) -> 'INode':
-        """从字节数据解析iNode"""
-        inode_id = struct.unpack_from('<H', data, 0)[0]
-        file_type = FileType(struct.unpack_from('<B', data, 2)[0])
-        permissions = struct.unpack_from('<B', data, 3)[0]
-        size = struct.unpack_from('<I', data, 4)[0]
-        create_time = struct.unpack_from('<Q', data, 8)[0]
-        modify_time = struct.unpack_from('<Q', data, 16)[0]
-        link_count = struct.unpack_from('<H', data, 24)[0]
-        
-        direct_blocks = []
-        for i in range(DIRECT_BLOCKS):
-            block_id = struct.unpack_from('<H', data, 26 + i * 2)[0]
-            direct_blocks.append(block_id)
-        
-        single_indirect = struct.unpack_from('<H', data, 38)[0]
-        double_indirect = struct.unpack_from('<H', data, 40)[0]
-        
+        """从字节数据解析iNode（预编译的 INODE_HEAD 一次解析全部字段）"""
+        fields = INODE_HEAD.unpack_from(data, 0)
         return cls(
-            inode_id=inode_id,
-            file_type=file_type,
-            permissions=permissions,
-            size=size,
-            create_time=create_time,
-            modify_time=modify_time,
-            link_count=link_count,
-            direct_blocks=direct_blocks,
-            single_indirect=single_indirect,
-            double_indirect=double_indirect
+            inode_id=fields[0],
+            file_type=FileType(fields[1]),
+            permissions=fields[2],
+            size=fields[3],
+            create_time=fields[4],
+            modify_time=fields[5],
+            link_count=fields[6],
+            direct_blocks=list(fields[7:7 + DIRECT_BLOCKS]),
+            single_indirect=fields[7 + DIRECT_BLOCKS],
+            double_indirect=fields[8 + DIRECT_BLOCKS]
         )
     
     def to_bytes(self) -> bytes:
         """将iNode序列化为字节"""
         data = bytearray(INODE_SIZE)
-        
-        struct.pack_into('<H', data, 0, self.inode_id)
-        struct.pack_into('<B', data, 2, self.file_type.value)
-        struct.pack_into('<B', data, 3, self.permissions)
-        struct.pack_into('<I', data, 4, self.size)
-        struct.pack_into('<Q', data, 8, self.create_time)
-        struct.pack_into('<Q', data, 16, self.modify_time)
-        struct.pack_into('<H', data, 24, self.link_count)
-        
-        for i, block_id in enumerate(self.direct_blocks[:DIRECT_BLOCKS]):
-            struct.pack_into('<H', data, 26 + i * 2, block_id)
-        
-        struct.pack_into('<H', data, 38, self.single_indirect)
-        struct.pack_into('<H', data, 40, self.double_indirect)
-        
+        direct_blocks = self.direct_blocks[:DIRECT_BLOCKS]
+        if len(direct_blocks) < DIRECT_BLOCKS:
+            direct_blocks = direct_blocks + [0] * (DIRECT_BLOCKS - len(direct_blocks))
+        INODE_HEAD.pack_into(
+            data, 0,
+            self.inode_id, self.file_type.value, self.permissions, self.size,
+            self.create_time, self.modify_time, self.link_count,
+            *direct_blocks, self.single_indirect, self.double_indirect
+        )
         return bytes(data)
 
 
@@ -122,11 +123,11 @@ class DirectoryEntry:
     @classmethod
     def from_bytes(cls, data: bytes) -> Optional['DirectoryEntry']:
         """从字节解析目录项"""
-        if len(data) < 26:
+        if len(data) < _DIRENTRY.size:
             return None
         
         # 文件名（24字节，以\0结尾）
-        name_bytes = data[:24]
+        name_bytes, inode_id = _DIRENTRY.unpack_from(data, 0)
         try:
             name = name_bytes.rstrip(b'\x00').decode('utf-8')
         except:
@@ -135,16 +136,12 @@ class DirectoryEntry:
         if not name:
             return None
         
-        inode_id = struct.unpack_from('<H', data, 24)[0]
         return cls(name=name, inode_id=inode_id)
     
     def to_bytes(self) -> bytes:
         """序列化为字节"""
-        data = bytearray(26)
-        name_bytes = self.name.encode('utf-8')[:24]
-        data[:len(name_bytes)] = name_bytes
-        struct.pack_into('<H', data, 24, self.inode_id)
-        return bytes(data)
+        # '24s' 自动截断过长的文件名并以 \0 补齐
+        return _DIRENTRY.pack(self.name.encode('utf-8'), self.inode_id)
 
 
 class FileSystem:
@@ -157,16 +154,40 @@ class FileSystem:
     # 每个目录块可存放的目录项数
     ENTRIES_PER_BLOCK = BLOCK_SIZE // 26  # 26字节/目录项
     
-    def __init__(self, disk: VirtualDisk):
-        """初始化文件系统"""
+    def __init__(self, disk: VirtualDisk, buffer=None):
+        """
+        初始化文件系统
+        
+        Args:
+            disk: 虚拟磁盘对象
+            buffer: 缓冲管理器；提供时文件数据块的读写都经过缓冲区（写入只标记脏页），
+                    元数据块（目录、索引块、iNode）仍直接读写磁盘
+        """
         self.disk = disk
+        self.buffer = buffer
         self.lock = threading.RLock()
         
         # 文件打开表（记录正在使用的文件）
         self.open_files: Dict[int, Dict[str, Any]] = {}  # inode_id -> {process_id, mode, ...}
         
-        # iNode位图（内存中）
-        self.inode_bitmap = [False] * MAX_INODES
+        # 已解析iNode的缓存（所有iNode写入都经过本类，缓存随之更新）
+        self.inode_cache = InodeCache()
+        
+        # 目录项缓存：目录 iNode 号 -> {文件名: iNode号}，首次查找时由目录块建立，增删目录项时同步更新
+        self._dentry_cache: Dict[int, Dict[str, int]] = {}
+        
+        # I/O 延时：开启逐块延时且有进度回调时每块等待 IO_DELAY，便于界面逐块观察；
+        # 否则按 FS_BATCH_IO_DELAY 决定是否在操作结束后一次性等待（累计值按线程记录）
+        self.visualize_delay = FS_VISUALIZE_DELAY
+        self.batch_delay = FS_BATCH_IO_DELAY
+        self._local = threading.local()
+        
+        # 版本号：iNode 使用情况或文件打开表变化时自增，供调用方判断统计结果是否仍然有效
+        self.version = 0
+        
+        # iNode位图（内存中，NumPy 布尔数组）与空闲 iNode 号的最小堆
+        self.inode_bitmap = np.zeros(MAX_INODES, dtype=bool)
+        self._free_inodes: List[int] = []
         self._load_inode_bitmap()
         
         # 当前工作目录
@@ -175,44 +196,100 @@ class FileSystem:
         # 目录路径栈（用于支持返回上级目录）
         self.path_stack: List[str] = []  # 存储路径名
         self.inode_stack: List[int] = [0]  # 存储inode号，初始为根目录
+        # inode_stack 的集合形式，判断某目录是否在当前路径上时 O(1) 查找（目录树中同一目录只会出现一次）
+        self._inode_stack_set = {0}
+    
+    def set_visualize_delay(self, enabled: bool, batch: Optional[bool] = None):
+        """开启或关闭逐块 I/O 延时；batch 不为 None 时同时设置操作结束后的一次性延时"""
+        with self.lock:
+            self.visualize_delay = enabled
+            if batch is not None:
+                self.batch_delay = batch
+            self.version += 1
+    
+    def _io_delay(self, scale: float = 1.0):
+        """一个块的 I/O 延时：逐块可视化时立即等待，批量模式下累计到操作结束"""
+        if self.visualize_delay and _progress_callback is not None:
+            time.sleep(IO_DELAY * scale)
+        elif self.batch_delay:
+            local = self._local
+            local.pending_delay = getattr(local, 'pending_delay', 0.0) + IO_DELAY * scale
     
     def _load_inode_bitmap(self):
-        """加载iNode使用情况"""
-        for i in range(MAX_INODES):
-            inode_data = self.disk.read_inode(i)
-            file_type = struct.unpack_from('<B', inode_data, 2)[0]
-            self.inode_bitmap[i] = (file_type != 0)
+        """加载iNode使用情况：一次读出整个iNode区，取每个iNode的 file_type 字节列"""
+        table = np.frombuffer(self.disk.read_inode_table(), dtype=np.uint8).reshape(MAX_INODES, INODE_SIZE)
+        self.inode_bitmap = table[:, 2] != 0
+        # 升序列表本身就是合法的最小堆
+        self._free_inodes = np.flatnonzero(~self.inode_bitmap).tolist()
     
     def _allocate_inode(self) -> Optional[int]:
-        """分配一个空闲iNode"""
-        for i in range(MAX_INODES):
-            if not self.inode_bitmap[i]:
-                self.inode_bitmap[i] = True
-                return i
-        return None
+        """分配一个空闲iNode（从最小堆取出编号最小的空闲iNode）"""
+        if not self._free_inodes:
+            return None
+        i = heapq.heappop(self._free_inodes)
+        self.inode_bitmap[i] = True
+        self.version += 1
+        return i
     
     def _free_inode(self, inode_id: int):
         """释放iNode"""
         if 0 < inode_id < MAX_INODES:  # 不允许释放根目录
+            if self.inode_bitmap[inode_id]:
+                heapq.heappush(self._free_inodes, inode_id)
             self.inode_bitmap[inode_id] = False
+            self.version += 1
             # 清空iNode数据
             empty_inode = bytes(INODE_SIZE)
             self.disk.write_inode(inode_id, empty_inode)
+            self.inode_cache.invalidate(inode_id)
+            self._dentry_cache.pop(inode_id, None)
+    
+    @staticmethod
+    def _copy_inode(inode: INode) -> INode:
+        """复制iNode（调用方会原地修改返回的对象，缓存中需保留独立副本）"""
+        return replace(inode, direct_blocks=list(inode.direct_blocks))
     
     def _get_inode(self, inode_id: int) -> Optional[INode]:
-        """获取iNode"""
+        """获取iNode（优先从缓存读取）"""
         if inode_id < 0 or inode_id >= MAX_INODES:
             return None
         
+        cached = self.inode_cache.get(inode_id)
+        if cached is not None:
+            return self._copy_inode(cached)
+        
         data = self.disk.read_inode(inode_id)
-        if struct.unpack_from('<B', data, 2)[0] == 0:
+        if data[2] == 0:  # file_type 为 FREE
             return None
         
-        return INode.from_bytes(data)
+        inode = INode.from_bytes(data)
+        self.inode_cache.put(inode_id, self._copy_inode(inode))
+        return inode
     
     def _save_inode(self, inode: INode):
-        """保存iNode"""
+        """保存iNode（同时更新缓存）"""
         self.disk.write_inode(inode.inode_id, inode.to_bytes())
+        self.inode_cache.put(inode.inode_id, self._copy_inode(inode))
+    
+    def _read_data_block(self, block_id: int, process_id: int = 0) -> bytes:
+        """读取文件数据块（有缓冲区时经缓冲区读取）"""
+        if self.buffer is not None:
+            data = self.buffer.read_page(block_id, process_id)
+            if data is not None:
+                return data
+        return self.disk.read_block(block_id)
+    
+    def _write_data_block(self, block_id: int, data: bytes, process_id: int = 0):
+        """写入文件数据块（有缓冲区时写入缓冲页并标记为脏页，由缓冲区负责写回）"""
+        if self.buffer is not None and self.buffer.write_page(block_id, data, process_id):
+            return
+        self.disk.write_block(block_id, data)
+    
+    def _release_block(self, block_id: int):
+        """释放磁盘块，并丢弃其缓冲页，避免脏页日后写回到已被重新分配的块"""
+        if self.buffer is not None:
+            self.buffer.discard_block(block_id)
+        self.disk.free_block(block_id)
     
     def _get_file_blocks(self, inode: INode) -> List[int]:
         """
@@ -228,40 +305,44 @@ class FileSystem:
         
         # 一级间接索引
         if inode.single_indirect > 0:
-            indirect_data = self.disk.read_block(inode.single_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                block_id = struct.unpack_from('<H', indirect_data, i * 2)[0]
-                if block_id > 0:
-                    blocks.append(block_id)
+            blocks.extend(self._read_pointers(inode.single_indirect))
         
         # 二级间接索引
         if inode.double_indirect > 0:
-            double_data = self.disk.read_block(inode.double_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                single_ptr = struct.unpack_from('<H', double_data, i * 2)[0]
-                if single_ptr > 0:
-                    indirect_data = self.disk.read_block(single_ptr)
-                    for j in range(POINTERS_PER_BLOCK):
-                        block_id = struct.unpack_from('<H', indirect_data, j * 2)[0]
-                        if block_id > 0:
-                            blocks.append(block_id)
+            for single_ptr in self._read_pointers(inode.double_indirect):
+                blocks.extend(self._read_pointers(single_ptr))
         
         return blocks
     
-    def _allocate_file_blocks(self, inode: INode, block_count: int) -> bool:
+    def _read_pointers(self, block_id: int) -> List[int]:
+        """读取索引块，返回其中非零的块指针（按 uint16 数组整体解析）"""
+        ptrs = np.frombuffer(self.disk.read_block(block_id), dtype='<u2', count=POINTERS_PER_BLOCK)
+        return ptrs[ptrs > 0].tolist()
+    
+    def _allocate_file_blocks(self, inode: INode, block_count: int,
+                              current_blocks: Optional[List[int]] = None) -> Optional[List[int]]:
         """
         为文件分配数据块
         采用混合索引方式
+        
+        Args:
+            inode: 文件iNode（原地更新索引）
+            block_count: 文件需要的总块数
+            current_blocks: 调用方已获取的现有块列表，传入时不再重新读取索引
+            
+        Returns:
+            分配后文件的全部数据块号，失败返回None
         """
-        current_blocks = self._get_file_blocks(inode)
+        if current_blocks is None:
+            current_blocks = self._get_file_blocks(inode)
         needed = block_count - len(current_blocks)
         
         if needed <= 0:
-            return True
+            return current_blocks
         
         new_blocks = self.disk.allocate_blocks(needed)
         if len(new_blocks) < needed:
-            return False
+            return None
         
         all_blocks = current_blocks + new_blocks
         
@@ -281,7 +362,7 @@ class FileSystem:
             if inode.single_indirect == 0:
                 single_block = self.disk.allocate_block()
                 if single_block is None:
-                    return False
+                    return None
                 inode.single_indirect = single_block
             
             indirect_data = bytearray(BLOCK_SIZE)
@@ -296,7 +377,7 @@ class FileSystem:
             if inode.double_indirect == 0:
                 double_block = self.disk.allocate_block()
                 if double_block is None:
-                    return False
+                    return None
                 inode.double_indirect = double_block
             
             double_data = bytearray(BLOCK_SIZE)
@@ -305,7 +386,7 @@ class FileSystem:
             while idx < len(all_blocks) and single_idx < POINTERS_PER_BLOCK:
                 single_block = self.disk.allocate_block()
                 if single_block is None:
-                    return False
+                    return None
                 
                 struct.pack_into('<H', double_data, single_idx * 2, single_block)
                 
@@ -320,37 +401,85 @@ class FileSystem:
             
             self.disk.write_block(inode.double_indirect, bytes(double_data))
         
-        return True
+        return all_blocks
+    
+    def _truncate_file_blocks(self, inode: INode, keep: int, blocks: List[int]) -> List[int]:
+        """
+        将文件截短为前 keep 个数据块
+        释放其余数据块及不再需要的索引块，并清除 iNode 与索引块中对应的指针，
+        避免之后经这些指针写入已释放（可能已重新分配）的块
+        
+        Args:
+            inode: 文件iNode（原地更新索引，由调用方保存）
+            keep: 保留的数据块数
+            blocks: 文件当前的全部数据块号
+            
+        Returns:
+            保留的数据块号
+        """
+        for block_id in blocks[keep:]:
+            self._release_block(block_id)
+        
+        # 直接索引
+        for i in range(keep, DIRECT_BLOCKS):
+            inode.direct_blocks[i] = 0
+        remaining = keep - DIRECT_BLOCKS
+        
+        # 一级间接索引
+        if inode.single_indirect > 0:
+            if remaining <= 0:
+                self._release_block(inode.single_indirect)
+                inode.single_indirect = 0
+            else:
+                self._clear_pointers(inode.single_indirect, remaining)
+            remaining -= POINTERS_PER_BLOCK
+        
+        # 二级间接索引
+        if inode.double_indirect > 0:
+            double_ptrs = self._read_pointers(inode.double_indirect)
+            for i, single_ptr in enumerate(double_ptrs):
+                kept = remaining - i * POINTERS_PER_BLOCK
+                if kept <= 0:
+                    self._release_block(single_ptr)
+                elif kept < POINTERS_PER_BLOCK:
+                    self._clear_pointers(single_ptr, kept)
+            if remaining <= 0:
+                self._release_block(inode.double_indirect)
+                inode.double_indirect = 0
+            else:
+                self._clear_pointers(inode.double_indirect,
+                                     (remaining + POINTERS_PER_BLOCK - 1) // POINTERS_PER_BLOCK)
+        
+        return blocks[:keep]
+    
+    def _clear_pointers(self, index_block: int, keep: int):
+        """清零索引块中第 keep 个之后的指针"""
+        if keep >= POINTERS_PER_BLOCK:
+            return
+        data = bytearray(self.disk.read_block_view(index_block))
+        data[keep * 2:POINTERS_PER_BLOCK * 2] = bytes((POINTERS_PER_BLOCK - keep) * 2)
+        self.disk.write_block(index_block, data)
     
     def _free_file_blocks(self, inode: INode):
         """释放文件的所有数据块"""
         # 释放直接索引块
         for block_id in inode.direct_blocks:
             if block_id > 0:
-                self.disk.free_block(block_id)
+                self._release_block(block_id)
         
         # 释放一级间接索引
         if inode.single_indirect > 0:
-            indirect_data = self.disk.read_block(inode.single_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                block_id = struct.unpack_from('<H', indirect_data, i * 2)[0]
-                if block_id > 0:
-                    self.disk.free_block(block_id)
-            self.disk.free_block(inode.single_indirect)
+            for block_id in self._read_pointers(inode.single_indirect):
+                self._release_block(block_id)
+            self._release_block(inode.single_indirect)
         
         # 释放二级间接索引
         if inode.double_indirect > 0:
-            double_data = self.disk.read_block(inode.double_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                single_ptr = struct.unpack_from('<H', double_data, i * 2)[0]
-                if single_ptr > 0:
-                    indirect_data = self.disk.read_block(single_ptr)
-                    for j in range(POINTERS_PER_BLOCK):
-                        block_id = struct.unpack_from('<H', indirect_data, j * 2)[0]
-                        if block_id > 0:
-                            self.disk.free_block(block_id)
-                    self.disk.free_block(single_ptr)
-            self.disk.free_block(inode.double_indirect)
+            for single_ptr in self._read_pointers(inode.double_indirect):
+                for block_id in self._read_pointers(single_ptr):
+                    self._release_block(block_id)
+                self._release_block(single_ptr)
+            self._release_block(inode.double_indirect)
     
     def _free_file_blocks_with_progress(self, inode: INode, filename: str):
         """释放文件的所有数据块（带进度通知）"""
@@ -363,38 +492,29 @@ class FileSystem:
             if block_id > 0:
                 block_count += 1
                 notify_progress('delete', filename, block_count, total, block_id)
-                self.disk.free_block(block_id)
-                time.sleep(IO_DELAY * 0.5)  # 删除延时（较短）
+                self._release_block(block_id)
+                self._io_delay(0.5)  # 删除延时（较短）
         
         # 释放一级间接索引中的数据块
         if inode.single_indirect > 0:
-            indirect_data = self.disk.read_block(inode.single_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                block_id = struct.unpack_from('<H', indirect_data, i * 2)[0]
-                if block_id > 0:
-                    block_count += 1
-                    notify_progress('delete', filename, block_count, total, block_id)
-                    self.disk.free_block(block_id)
-                    time.sleep(IO_DELAY * 0.5)
+            for block_id in self._read_pointers(inode.single_indirect):
+                block_count += 1
+                notify_progress('delete', filename, block_count, total, block_id)
+                self._release_block(block_id)
+                self._io_delay(0.5)
             # 释放间接索引块本身
-            self.disk.free_block(inode.single_indirect)
+            self._release_block(inode.single_indirect)
         
         # 释放二级间接索引
         if inode.double_indirect > 0:
-            double_data = self.disk.read_block(inode.double_indirect)
-            for i in range(POINTERS_PER_BLOCK):
-                single_ptr = struct.unpack_from('<H', double_data, i * 2)[0]
-                if single_ptr > 0:
-                    indirect_data = self.disk.read_block(single_ptr)
-                    for j in range(POINTERS_PER_BLOCK):
-                        block_id = struct.unpack_from('<H', indirect_data, j * 2)[0]
-                        if block_id > 0:
-                            block_count += 1
-                            notify_progress('delete', filename, block_count, total, block_id)
-                            self.disk.free_block(block_id)
-                            time.sleep(IO_DELAY * 0.5)
-                    self.disk.free_block(single_ptr)
-            self.disk.free_block(inode.double_indirect)
+            for single_ptr in self._read_pointers(inode.double_indirect):
+                for block_id in self._read_pointers(single_ptr):
+                    block_count += 1
+                    notify_progress('delete', filename, block_count, total, block_id)
+                    self._release_block(block_id)
+                    self._io_delay(0.5)
+                self._release_block(single_ptr)
+            self._release_block(inode.double_indirect)
         
         # 清空iNode中的索引
         inode.direct_blocks = [0] * DIRECT_BLOCKS
@@ -420,25 +540,22 @@ class FileSystem:
         """向目录添加一个条目"""
         blocks = self._get_file_blocks(dir_inode)
         
-        # 尝试在现有块中找空位
+        # 尝试在现有块中找空位（文件名首字节为0的目录项）
         for block_id in blocks:
-            block_data = bytearray(self.disk.read_block(block_id))
-            for i in range(self.ENTRIES_PER_BLOCK):
-                entry_data = block_data[i * 26:(i + 1) * 26]
-                if entry_data[0] == 0:  # 空目录项
-                    block_data[i * 26:(i + 1) * 26] = entry.to_bytes()
-                    self.disk.write_block(block_id, bytes(block_data))
-                    return True
+            block_data = bytearray(self.disk.read_block_view(block_id))
+            free = np.flatnonzero(self._entry_array(block_data)[:, 0] == 0)
+            if free.size:
+                i = int(free[0])
+                block_data[i * 26:(i + 1) * 26] = entry.to_bytes()
+                self.disk.write_block(block_id, block_data)
+                self._cache_dentry(dir_inode.inode_id, entry)
+                return True
         
         # 需要分配新块给目录
         # 使用 _allocate_file_blocks 来正确分配并更新 inode 索引
         new_block_count = len(blocks) + 1
-        if not self._allocate_file_blocks(dir_inode, new_block_count):
-            return False
-        
-        # 重新获取块列表，找到新分配的块
-        new_blocks = self._get_file_blocks(dir_inode)
-        if len(new_blocks) < new_block_count:
+        new_blocks = self._allocate_file_blocks(dir_inode, new_block_count, blocks)
+        if new_blocks is None:
             return False
         
         # 新块是列表中最后一个
@@ -452,33 +569,54 @@ class FileSystem:
         # 更新目录大小
         dir_inode.size += 26
         self._save_inode(dir_inode)
+        self._cache_dentry(dir_inode.inode_id, entry)
         
         return True
     
+    def _cache_dentry(self, dir_inode_id: int, entry: DirectoryEntry):
+        """新目录项写入磁盘后同步到目录项缓存（该目录尚未缓存时无需处理）"""
+        names = self._dentry_cache.get(dir_inode_id)
+        if names is not None:
+            names.setdefault(entry.name, entry.inode_id)
+    
     def _remove_directory_entry(self, dir_inode: INode, filename: str) -> bool:
         """从目录移除一个条目"""
+        name_bytes = filename.encode('utf-8')
+        if not name_bytes or len(name_bytes) > 24:
+            return False
+        # 目录项中的文件名以 \0 补齐到24字节，整行比较即可匹配
+        needle = np.frombuffer(name_bytes.ljust(24, b'\x00'), dtype=np.uint8)
         blocks = self._get_file_blocks(dir_inode)
         
         for block_id in blocks:
-            block_data = bytearray(self.disk.read_block(block_id))
-            for i in range(self.ENTRIES_PER_BLOCK):
-                entry_data = block_data[i * 26:(i + 1) * 26]
-                entry = DirectoryEntry.from_bytes(entry_data)
-                if entry and entry.name == filename:
-                    # 清空该条目
-                    block_data[i * 26:(i + 1) * 26] = b'\x00' * 26
-                    self.disk.write_block(block_id, bytes(block_data))
-                    return True
+            block_data = bytearray(self.disk.read_block_view(block_id))
+            matches = np.flatnonzero((self._entry_array(block_data)[:, :24] == needle).all(axis=1))
+            if matches.size:
+                # 清空该条目
+                i = int(matches[0])
+                block_data[i * 26:(i + 1) * 26] = b'\x00' * 26
+                self.disk.write_block(block_id, block_data)
+                names = self._dentry_cache.get(dir_inode.inode_id)
+                if names is not None:
+                    names.pop(filename, None)
+                return True
         
         return False
     
+    def _entry_array(self, block_data: bytearray) -> np.ndarray:
+        """把目录块视作 (ENTRIES_PER_BLOCK, 26) 的字节矩阵，每行一个目录项（不复制）"""
+        return np.frombuffer(block_data, dtype=np.uint8,
+                             count=self.ENTRIES_PER_BLOCK * 26).reshape(self.ENTRIES_PER_BLOCK, 26)
+    
     def _find_in_directory(self, dir_inode: INode, filename: str) -> Optional[int]:
-        """在目录中查找文件，返回iNode号"""
-        entries = self._read_directory(dir_inode)
-        for entry in entries:
-            if entry.name == filename:
-                return entry.inode_id
-        return None
+        """在目录中查找文件，返回iNode号（经目录项缓存查找，未缓存时读一次目录建立缓存）"""
+        names = self._dentry_cache.get(dir_inode.inode_id)
+        if names is None:
+            names = {}
+            for entry in self._read_directory(dir_inode):
+                names.setdefault(entry.name, entry.inode_id)  # 同名时与顺序扫描一致，取第一个
+            self._dentry_cache[dir_inode.inode_id] = names
+        return names.get(filename)
     
     def _validate_filename(self, filename: str) -> Optional[str]:
         """
@@ -513,8 +651,10 @@ class FileSystem:
             return None
         return file_inode.file_type.name
     
+    @_settle_io_delay
     def create_file(self, filename: str, content: bytes = b'', 
-                    permissions: int = PERM_READ | PERM_WRITE) -> Dict[str, Any]:
+                    permissions: int = PERM_READ | PERM_WRITE,
+                    process_id: int = 0) -> Dict[str, Any]:
         """
         创建新文件
         
@@ -522,6 +662,7 @@ class FileSystem:
             filename: 文件名
             content: 文件内容
             permissions: 文件权限
+            process_id: 发起创建的进程ID（用于缓冲页归属）
             
         Returns:
             操作结果字典
@@ -571,24 +712,22 @@ class FileSystem:
             )
             
             # 分配数据块
-            if not self._allocate_file_blocks(new_inode, block_count):
+            blocks = self._allocate_file_blocks(new_inode, block_count, [])
+            if blocks is None:
                 self._free_inode(new_inode_id)
                 return {'success': False, 'error': '磁盘空间不足'}
             
-            # 写入文件内容
-            blocks = self._get_file_blocks(new_inode)
+            # 写入文件内容：按块切 memoryview，不足一块的部分由缓冲区/磁盘写入时补零
+            view = memoryview(content)
             for i, block_id in enumerate(blocks):
                 start = i * BLOCK_SIZE
-                end = start + BLOCK_SIZE
-                block_data = content[start:end]
-                if len(block_data) < BLOCK_SIZE:
-                    block_data = block_data + b'\x00' * (BLOCK_SIZE - len(block_data))
+                block_data = view[start:start + BLOCK_SIZE]
                 
                 # 通知进度
                 notify_progress('write', filename, i + 1, len(blocks), block_id)
                 
-                self.disk.write_block(block_id, block_data)
-                time.sleep(IO_DELAY)  # I/O延时，用于可视化
+                self._write_data_block(block_id, block_data, process_id)
+                self._io_delay()  # I/O延时，用于可视化
             
             # 保存iNode
             self._save_inode(new_inode)
@@ -608,13 +747,16 @@ class FileSystem:
                 'message': f'文件 {filename} 创建成功'
             }
     
-    def read_file(self, filename: str, block_index: int = -1) -> Dict[str, Any]:
+    @_settle_io_delay
+    def read_file(self, filename: str, block_index: int = -1,
+                  process_id: int = 0) -> Dict[str, Any]:
         """
         读取文件内容
         
         Args:
             filename: 文件名
             block_index: 要读取的块索引，-1表示读取全部
+            process_id: 发起读取的进程ID
             
         Returns:
             文件内容和元信息
@@ -645,8 +787,8 @@ class FileSystem:
                 # 通知进度
                 notify_progress('read', filename, 1, 1, blocks[block_index])
                 
-                block_data = self.disk.read_block(blocks[block_index])
-                time.sleep(IO_DELAY)
+                block_data = self._read_data_block(blocks[block_index], process_id)
+                self._io_delay()
                 
                 return {
                     'success': True,
@@ -661,9 +803,9 @@ class FileSystem:
                     # 通知进度
                     notify_progress('read', filename, i + 1, len(blocks), block_id)
                     
-                    block_data = self.disk.read_block(block_id)
+                    block_data = self._read_data_block(block_id, process_id)
                     content.extend(block_data)
-                    time.sleep(IO_DELAY)
+                    self._io_delay()
                 
                 # 截断到实际大小
                 content = bytes(content[:file_inode.size])
@@ -678,7 +820,9 @@ class FileSystem:
                     'modify_time': file_inode.modify_time
                 }
     
-    def write_file(self, filename: str, content: bytes, block_index: int = -1) -> Dict[str, Any]:
+    @_settle_io_delay
+    def write_file(self, filename: str, content: bytes, block_index: int = -1,
+                   process_id: int = 0) -> Dict[str, Any]:
         """
         修改文件内容
         
@@ -686,6 +830,7 @@ class FileSystem:
             filename: 文件名
             content: 要写入的内容
             block_index: 要修改的块索引，-1表示替换全部内容
+            process_id: 发起修改的进程ID（用于缓冲页归属）
             
         Returns:
             操作结果
@@ -713,12 +858,11 @@ class FileSystem:
                 if block_index >= len(blocks):
                     return {'success': False, 'error': f'块索引 {block_index} 超出范围'}
                 
-                block_data = content[:BLOCK_SIZE]
-                if len(block_data) < BLOCK_SIZE:
-                    block_data = block_data + b'\x00' * (BLOCK_SIZE - len(block_data))
+                # 不足一块的部分由缓冲区/磁盘写入时补零
+                block_data = memoryview(content)[:BLOCK_SIZE]
                 
-                self.disk.write_block(blocks[block_index], block_data)
-                time.sleep(IO_DELAY)
+                self._write_data_block(blocks[block_index], block_data, process_id)
+                self._io_delay()
             else:
                 # 替换全部内容
                 new_block_count = (len(content) + BLOCK_SIZE - 1) // BLOCK_SIZE
@@ -728,28 +872,25 @@ class FileSystem:
                 # 释放多余的块或分配新块
                 if new_block_count != len(blocks):
                     if new_block_count < len(blocks):
-                        # 释放多余的块
-                        for block_id in blocks[new_block_count:]:
-                            self.disk.free_block(block_id)
+                        # 释放多余的块，并清除 iNode 与索引块中指向它们的指针
+                        blocks = self._truncate_file_blocks(file_inode, new_block_count, blocks)
                     else:
                         # 分配新块
-                        if not self._allocate_file_blocks(file_inode, new_block_count):
+                        blocks = self._allocate_file_blocks(file_inode, new_block_count, blocks)
+                        if blocks is None:
                             return {'success': False, 'error': '磁盘空间不足'}
                 
-                # 写入内容
-                blocks = self._get_file_blocks(file_inode)
+                # 写入内容（同 create_file，按块切 memoryview）
+                view = memoryview(content)
                 for i, block_id in enumerate(blocks):
                     start = i * BLOCK_SIZE
-                    end = start + BLOCK_SIZE
-                    block_data = content[start:end]
-                    if len(block_data) < BLOCK_SIZE:
-                        block_data = block_data + b'\x00' * (BLOCK_SIZE - len(block_data))
+                    block_data = view[start:start + BLOCK_SIZE]
                     
                     # 通知进度
                     notify_progress('write', filename, i + 1, len(blocks), block_id)
                     
-                    self.disk.write_block(block_id, block_data)
-                    time.sleep(IO_DELAY)
+                    self._write_data_block(block_id, block_data, process_id)
+                    self._io_delay()
                 
                 file_inode.size = len(content)
             
@@ -763,6 +904,7 @@ class FileSystem:
                 'new_size': len(content) if block_index < 0 else file_inode.size
             }
     
+    @_settle_io_delay
     def delete_file(self, filename: str, process_id: int = None) -> Dict[str, Any]:
         """
         删除文件
@@ -788,7 +930,7 @@ class FileSystem:
                 return {'success': False, 'error': f'"{filename}" 不存在'}
             
             # 检查是否试图删除当前工作路径中的目录
-            if inode_id in self.inode_stack:
+            if inode_id in self._inode_stack_set:
                 return {'success': False, 'error': f'无法删除 "{filename}"：目录正在使用中'}
             
             # 检查文件是否正在被使用（文件保护）
@@ -924,7 +1066,7 @@ class FileSystem:
             # 添加目录项
             entry = DirectoryEntry(name=dirname, inode_id=new_inode_id)
             if not self._add_directory_entry(dir_inode, entry):
-                self.disk.free_block(block_id)
+                self._release_block(block_id)
                 self._free_inode(new_inode_id)
                 return {'success': False, 'error': '无法添加目录项'}
             
@@ -949,7 +1091,7 @@ class FileSystem:
                     }
                 
                 # 弹出当前目录
-                self.inode_stack.pop()
+                self._inode_stack_set.discard(self.inode_stack.pop())
                 self.path_stack.pop()
                 self.current_dir_inode = self.inode_stack[-1]
                 
@@ -977,6 +1119,7 @@ class FileSystem:
             # 更新路径栈
             self.path_stack.append(dirname)
             self.inode_stack.append(target_inode_id)
+            self._inode_stack_set.add(target_inode_id)
             
             current_path = '/' + '/'.join(self.path_stack)
             return {
@@ -1017,6 +1160,7 @@ class FileSystem:
                 'mode': mode,
                 'open_time': time.time()
             }
+            self.version += 1
             
             return {
                 'success': True,
@@ -1040,6 +1184,7 @@ class FileSystem:
                 return {'success': False, 'error': f'文件 {filename} 不属于进程 {process_id}'}
             
             del self.open_files[inode_id]
+            self.version += 1
             return {
                 'success': True,
                 'message': f'文件 {filename} 已关闭'
@@ -1076,11 +1221,17 @@ class FileSystem:
                 'is_open': inode_id in self.open_files
             }
     
-    def get_filesystem_stats(self) -> Dict[str, Any]:
-        """获取文件系统统计信息"""
+    def get_filesystem_stats(self, disk_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        获取文件系统统计信息
+        
+        Args:
+            disk_info: 调用方已获取的磁盘信息，传入时不再重复查询磁盘
+        """
         with self.lock:
-            disk_info = self.disk.get_disk_info()
-            used_inodes = sum(1 for x in self.inode_bitmap if x)
+            if disk_info is None:
+                disk_info = self.disk.get_disk_info()
+            used_inodes = MAX_INODES - len(self._free_inodes)
             
             return {
                 'total_blocks': disk_info['total_blocks'],
@@ -1110,4 +1261,5 @@ class FileSystem:
             self.current_dir_inode = 0
             self.path_stack = []
             self.inode_stack = [0]
+            self._inode_stack_set = {0}
 
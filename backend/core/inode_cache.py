@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+操作系统课程设计 - iNode缓存模块
+缓存已解析的 iNode，减少重复的磁盘读取与解析
+采用 LRU 策略淘汰，写入或释放 iNode 时同步更新
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Any
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+
+class InodeCache:
+    """
+    iNode缓存
+    inode_id -> 已解析的 iNode；命中时移到队尾，超出容量时淘汰队首（最久未使用）
+    """
+
+    def __init__(self, capacity: int = INODE_CACHE_SIZE):
+        """
+        初始化缓存
+
+        Args:
+            capacity: 最多缓存的 iNode 数
+        """
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self._entries: 'OrderedDict[int, Any]' = OrderedDict()
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, inode_id: int) -> Optional[Any]:
+        """查找 iNode，未缓存时返回 None"""
+        with self.lock:
+            inode = self._entries.get(inode_id)
+            if inode is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(inode_id)
+            self.hits += 1
+            return inode
+
+    def put(self, inode_id: int, inode: Any):
+        """缓存 iNode"""
+        with self.lock:
+            self._entries[inode_id] = inode
+            self._entries.move_to_end(inode_id)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, inode_id: int):
+        """使指定 iNode 的缓存失效"""
+        with self.lock:
+            self._entries.pop(inode_id, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self.lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """获取缓存统计信息"""
+        with self.lock:
+            return {
+                'cached': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+操作系统课程设计 - iNode解码模块
+单个 iNode 用预编译的 struct.Struct 一次解析全部字段；
+多个连续存放的 iNode 用 NumPy 结构化类型整体解析为数组
+"""
+
+import os
+import struct
+import sys
+from typing import Tuple
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import *
+
+
+# 各字段的 struct 格式，字段偏移由此推导，单条与整表两种解析共用同一份布局
+_INODE_FIELDS = [
+    ('inode_id', 'H'), ('file_type', 'B'), ('permissions', 'B'), ('size', 'I'),
+    ('create_time', 'Q'), ('modify_time', 'Q'), ('link_count', 'H'),
+    ('direct_blocks', f'{DIRECT_BLOCKS}H'), ('single_indirect', 'H'), ('double_indirect', 'H'),
+]
+_INODE_OFFSETS = [
+    struct.calcsize('<' + ''.join(fmt for _, fmt in _INODE_FIELDS[:i]))
+    for i in range(len(_INODE_FIELDS))
+]
+
+# iNode 头部布局（小端序，共42字节），与 INode.to_bytes 保持一致
+INODE_HEAD = struct.Struct('<' + ''.join(fmt for _, fmt in _INODE_FIELDS))
+
+# 同一布局的 NumPy 描述，用于整表解析
+INODE_DTYPE = np.dtype({
+    'names': [name for name, _ in _INODE_FIELDS],
+    'formats': ['<u2', 'u1', 'u1', '<u4',
+                '<u8', '<u8', '<u2',
+                ('<u2', (DIRECT_BLOCKS,)), '<u2', '<u2'],
+    'offsets': _INODE_OFFSETS,
+    'itemsize': INODE_SIZE
+})
+
+
+def decode_inode(inode_data: bytes) -> Tuple:
+    """
+    解析单个 iNode
+
+    Returns:
+        (inode_id, file_type, permissions, size, create_time, modify_time,
+         link_count, direct_blocks, single_indirect, double_indirect)，
+        其中 direct_blocks 为列表，其余为整数
+    """
+    fields = INODE_HEAD.unpack_from(inode_data, 0)
+    return fields[:7] + (list(fields[7:7 + DIRECT_BLOCKS]),) + fields[7 + DIRECT_BLOCKS:]
+
+
+def decode_inodes(table_data: bytes) -> np.ndarray:
+    """将连续存放的多个 iNode 解析为结构化数组（按 inode_id 顺序）"""
+    return np.frombuffer(table_data, dtype=INODE_DTYPE)
@@ -10,6 +10,7 @@ import threading
 import time
 import mmap
 import struct
+from contextlib import contextmanager
 from typing import Optional, Dict, List, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -22,6 +23,7 @@ class SharedMemorySegment:
     """
     共享内存段
     模拟操作系统的共享内存机制
+    数据区为匿名共享映射（MAP_SHARED），由操作系统分配页面，读写直接作用于映射内存
     """
     
     def __init__(self, key: int, size: int):
@@ -34,7 +36,7 @@ class SharedMemorySegment:
         """
         self.key = key
         self.size = size
-        self.data = bytearray(size)
+        self.data = mmap.mmap(-1, size)
         self.lock = threading.RLock()
         self.condition = threading.Condition(self.lock)
         
@@ -83,7 +85,11 @@ class SharedMemorySegment:
             if offset < 0 or offset + length > self.size:
                 return None
             
-            result = bytes(self.data[offset:offset + length])
+            if self.data.closed:
+                return None
+            
+            # mmap 切片直接生成 bytes，只复制一次
+            result = self.data[offset:offset + length]
             
             with self.lock:
                 self.read_count += 1
@@ -112,6 +118,8 @@ class SharedMemorySegment:
             # 写入数据
             if offset < 0 or offset + len(data) > self.size:
                 return False
+            if self.data.closed:
+                return False
             
             self.data[offset:offset + len(data)] = data
             
@@ -125,6 +133,13 @@ class SharedMemorySegment:
                 self.writers -= 1
                 self.condition.notify_all()
     
+    def close(self):
+        """等待进行中的读写结束后解除映射"""
+        with self.condition:
+            while self.readers > 0 or self.writers > 0:
+                self.condition.wait()
+            self.data.close()
+    
     def get_info(self) -> Dict[str, Any]:
         """获取共享内存段信息"""
         with self.lock:
@@ -153,6 +168,8 @@ class SharedMemoryManager:
         self.lock = threading.RLock()
         self.segments: Dict[int, SharedMemorySegment] = {}
         self.next_key = 1
+        # 版本号：段的增删或读写统计变化时自增，供调用方判断统计结果是否仍然有效
+        self.version = 0
         
         # 统计信息
         self.stats = {
@@ -173,6 +190,9 @@ class SharedMemoryManager:
         Returns:
             共享内存标识符
         """
+        if not isinstance(size, int) or size <= 0:
+            return -1  # 映射大小必须为正整数
+        
         with self.lock:
             if key is None:
                 key = self.next_key
@@ -183,6 +203,7 @@ class SharedMemoryManager:
             segment = SharedMemorySegment(key, size)
             self.segments[key] = segment
             self.stats['total_created'] += 1
+            self.version += 1
             
             return key
     
@@ -208,8 +229,10 @@ class SharedMemoryManager:
             
             del self.segments[key]
             self.stats['total_destroyed'] += 1
-            
-            return True
+            self.version += 1
+        
+        segment.close()
+        return True
     
     def attach(self, key: int, process_id: int) -> bool:
         """
@@ -268,6 +291,7 @@ class SharedMemoryManager:
         if result is not None:
             with self.lock:
                 self.stats['total_reads'] += 1
+                self.version += 1
         
         return result
     
@@ -294,6 +318,7 @@ class SharedMemoryManager:
         if result:
             with self.lock:
                 self.stats['total_writes'] += 1
+                self.version += 1
         
         return result
     
@@ -441,3 +466,67 @@ class ConditionVariable:
         with self.lock:
             return self.waiting_processes.copy()
 
+
+class ReadWriteLock:
+    """
+    读写锁
+    允许多个读者并发持有，写者独占；
+    有写者等待时新的读者需要排队，避免写者饥饿
+    """
+    
+    def __init__(self):
+        """初始化读写锁"""
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.readers = 0
+        self.writer_active = False
+        self.writers_waiting = 0
+    
+    def acquire_read(self):
+        """获取读锁"""
+        with self.condition:
+            while self.writer_active or self.writers_waiting > 0:
+                self.condition.wait()
+            self.readers += 1
+    
+    def release_read(self):
+        """释放读锁"""
+        with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+    
+    def acquire_write(self):
+        """获取写锁"""
+        with self.condition:
+            self.writers_waiting += 1
+            try:
+                while self.writer_active or self.readers > 0:
+                    self.condition.wait()
+            finally:
+                self.writers_waiting -= 1
+            self.writer_active = True
+    
+    def release_write(self):
+        """释放写锁"""
+        with self.condition:
+            self.writer_active = False
+            self.condition.notify_all()
+    
+    @contextmanager
+    def read_lock(self):
+        """以读者身份进入临界区"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write_lock(self):
+        """以写者身份进入临界区"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
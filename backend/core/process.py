@@ -5,6 +5,7 @@
 采用条件变量实现进程间同步与互斥
 """
 
+import itertools
 import os
 import threading
 import time
@@ -53,6 +54,16 @@ class CommandType(Enum):
     SCHED_STOP = 'sched_stop'      # 停止调度器
 
 
+# 命令字符串 -> 命令类型 的查找表（未知命令得到 None，无需捕获异常）
+COMMAND_BY_VALUE: Dict[str, CommandType] = {c.value: c for c in CommandType}
+
+# 可直接分派执行的命令（处理函数不会阻塞或让出CPU）
+INLINE_SAFE_COMMANDS = frozenset(
+    c for c in CommandType
+    if c not in (CommandType.LONG_TASK, CommandType.SCHED_START, CommandType.SCHED_STOP)
+)
+
+
 @dataclass
 class Process:
     """
@@ -96,7 +107,8 @@ class ProcessManager:
         
         # 进程表
         self.processes: Dict[int, Process] = {}
-        self.next_pid = 1
+        # PID 分配器：CPython 中 next() 对 itertools.count 是原子操作，分配 PID 无需加锁
+        self._pid_counter = itertools.count(1)
         
         # 进程队列
         self.ready_queue: queue.Queue = queue.Queue()
@@ -111,6 +123,9 @@ class ProcessManager:
         # 回调函数（用于执行实际命令）
         self.command_handlers: Dict[CommandType, Callable] = {}
         
+        # 统计版本号：进程表或统计信息变化时自增，供调用方判断统计结果是否仍然有效
+        self.version = 0
+        
         # 统计信息
         self.stats = {
             'total_created': 0,
@@ -126,6 +141,26 @@ class ProcessManager:
         """注册命令处理函数"""
         self.command_handlers[command_type] = handler
     
+    def register_handlers(self, handlers: Dict[CommandType, Callable]):
+        """批量注册命令处理函数（整表一次性替换，查找表中不会出现注册一半的状态）"""
+        table = dict(self.command_handlers)
+        table.update(handlers)
+        self.command_handlers = table
+    
+    def _notify_changed(self):
+        """进程状态变化：递增统计版本号并唤醒等待者（调用方需持有锁）"""
+        self.version += 1
+        self.condition.notify_all()
+    
+    def mark_changed(self):
+        """外部直接修改了进程控制块后调用，使统计版本号失效"""
+        with self.lock:
+            self.version += 1
+    
+    def get_handler(self, command_type: Optional[CommandType]) -> Optional[Callable]:
+        """获取命令处理函数，未注册时返回None"""
+        return self.command_handlers.get(command_type)
+    
     def create_process(self, name: str, command: CommandType, 
                        args: Dict[str, Any] = None, priority: int = 0) -> int:
         """
@@ -140,10 +175,8 @@ class ProcessManager:
         Returns:
             进程ID
         """
+        pid = next(self._pid_counter)
         with self.condition:
-            pid = self.next_pid
-            self.next_pid += 1
-            
             process = Process(
                 pid=pid,
                 name=name,
@@ -163,7 +196,7 @@ class ProcessManager:
             self.ready_queue.put(pid)
             
             # 通知调度器
-            self.condition.notify_all()
+            self._notify_changed()
             
             return pid
     
@@ -201,7 +234,7 @@ class ProcessManager:
                 pass
             
             self.stats['total_terminated'] += 1
-            self.condition.notify_all()
+            self._notify_changed()
             
             return True
     
@@ -226,7 +259,7 @@ class ProcessManager:
                     self.blocked_queue.append(pid)
                     if self.current_process == pid:
                         self.current_process = None
-                    self.condition.notify_all()
+                    self._notify_changed()
     
     def unblock_process(self, pid: int):
         """
@@ -241,7 +274,7 @@ class ProcessManager:
                 process.state = ProcessState.READY
                 self.blocked_queue.remove(pid)
                 self.ready_queue.put(pid)
-                self.condition.notify_all()
+                self._notify_changed()
     
     def wait_for_process(self, pid: int, timeout: float = None) -> Optional[Any]:
         """
@@ -291,17 +324,18 @@ class ProcessManager:
             
             process = self.processes[pid]
             
-            if process.command not in self.command_handlers:
+            handler = self.get_handler(process.command)
+            if handler is None:
                 return {'success': False, 'error': f'未知命令: {process.command}'}
             
             # 设置为运行状态
             process.state = ProcessState.RUNNING
             process.start_time = time.time()
             self.current_process = pid
+            self.version += 1
         
         try:
             # 执行命令（在锁外执行，避免死锁）
-            handler = self.command_handlers[process.command]
             result = handler(process.args, pid)
             
             with self.condition:
@@ -314,7 +348,7 @@ class ProcessManager:
                     self.current_process = None
                 
                 self.stats['total_completed'] += 1
-                self.condition.notify_all()
+                self._notify_changed()
             
             return result
             
@@ -327,10 +361,37 @@ class ProcessManager:
                 if self.current_process == pid:
                     self.current_process = None
                 
-                self.condition.notify_all()
+                self._notify_changed()
             
             return process.result
     
+    def dispatch_direct(self, command: CommandType, args: Dict[str, Any] = None,
+                        synthetic_pid: int = 0) -> Any:
+        """
+        直接分派不会让出CPU的简单命令
+        不创建PCB、不进入就绪队列、不通知调度器，在调用线程中直接执行处理函数；
+        长任务等需要调度的命令仍须走 create_process
+
+        Args:
+            command: 命令类型（须属于 INLINE_SAFE_COMMANDS）
+            args: 命令参数
+            synthetic_pid: 传给处理函数的进程ID（缓冲页归属）
+
+        Returns:
+            执行结果
+        """
+        if command not in INLINE_SAFE_COMMANDS:
+            return {'success': False, 'error': f'命令需经调度器执行: {command}'}
+
+        handler = self.get_handler(command)
+        if handler is None:
+            return {'success': False, 'error': f'未知命令: {command}'}
+
+        try:
+            return handler(args or {}, synthetic_pid)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
     def run_process_async(self, pid: int) -> threading.Thread:
         """
         异步执行进程
@@ -407,5 +468,5 @@ class ProcessManager:
             # 终止所有进程
             for pid in list(self.processes.keys()):
                 self.terminate_process(pid, force=True)
-            self.condition.notify_all()
+            self._notify_changed()
 
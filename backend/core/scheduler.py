@@ -11,6 +11,9 @@
 import os
 import threading
 import queue
+import time
+from collections import deque
+from itertools import islice
 from typing import Optional, Dict, List, Any, Callable
 from dataclasses import dataclass
 from enum import Enum
@@ -53,8 +56,12 @@ class RRScheduler:
         self.state = SchedulerState.STOPPED
         self.scheduler_thread: Optional[threading.Thread] = None
 
-        self.events: List[ScheduleEvent] = []
+        # 环形事件缓冲：超过上限时自动丢弃最旧的事件
         self.max_events = 200
+        self.events: deque = deque(maxlen=self.max_events)
+
+        # 每个进程一个事件：仅在该进程获得时间片时置位，等待方被定向唤醒
+        self._pid_events: Dict[int, threading.Event] = {}
 
         # 逻辑时钟（毫秒）
         self.logical_time_ms: int = 0
@@ -68,6 +75,8 @@ class RRScheduler:
             'idle_time_ms': 0,
             'start_time_ms': 0,
         }
+        # 统计版本号：调度状态、逻辑时钟或统计信息变化时自增，供调用方判断统计结果是否仍然有效
+        self.version = 0
 
         # 回调
         self.on_schedule: Optional[Callable[[int], None]] = None
@@ -83,6 +92,7 @@ class RRScheduler:
                 return
             self.state = SchedulerState.RUNNING
             self.stats['start_time_ms'] = self.logical_time_ms
+            self.version += 1
             self.scheduler_thread = threading.Thread(
                 target=self._scheduler_loop,
                 name="RRScheduler",
@@ -93,7 +103,11 @@ class RRScheduler:
     def stop(self):
         with self.condition:
             self.state = SchedulerState.STOPPED
+            self.version += 1
             self.condition.notify_all()
+            # 唤醒所有等待时间片的进程，使其重新检查调度器状态
+            for event in self._pid_events.values():
+                event.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=2.0)
 
@@ -101,11 +115,13 @@ class RRScheduler:
         with self.lock:
             if self.state == SchedulerState.RUNNING:
                 self.state = SchedulerState.PAUSED
+                self.version += 1
 
     def resume(self):
         with self.condition:
             if self.state == SchedulerState.PAUSED:
                 self.state = SchedulerState.RUNNING
+                self.version += 1
                 self.condition.notify_all()
 
     def set_event_emitter(self, emitter: Callable[[Dict[str, Any]], None]):
@@ -113,6 +129,7 @@ class RRScheduler:
 
     def add_process(self, pid: int):
         with self.condition:
+            self._pid_events.setdefault(pid, threading.Event())
             if pid not in self.ready_queue:
                 self.ready_queue.append(pid)
                 proc = self.process_manager.get_process(pid)
@@ -125,6 +142,7 @@ class RRScheduler:
         with self.lock:
             if pid in self.ready_queue:
                 self.ready_queue.remove(pid)
+                self.version += 1
 
     def notify_process_ready(self, pid: int):
         self.add_process(pid)
@@ -141,9 +159,26 @@ class RRScheduler:
             if pid == self.current_pid:
                 self.current_pid = None
             self.remove_process(pid)
+            event = self._pid_events.pop(pid, None)
+            if event is not None:
+                event.set()
             if not any(e.event_type == 'complete' and e.pid == pid for e in reversed(self.events)):
                 self._log_event('complete', pid, f'进程 {pid} 终止')
 
+    def wait_for_slice(self, pid: int, timeout: Optional[float] = None) -> bool:
+        """
+        等待指定进程获得下一个时间片
+
+        Returns:
+            是否在超时前获得了时间片（进程未登记时立即返回 False）
+        """
+        event = self._pid_events.get(pid)
+        if event is None:
+            return False
+        granted = event.wait(timeout)
+        event.clear()
+        return granted
+
     def get_current_process(self) -> Optional[int]:
         with self.lock:
             return self.current_pid
@@ -152,9 +187,30 @@ class RRScheduler:
         with self.lock:
             return list(self.ready_queue)
 
-    def get_events(self, count: int = 20) -> List[Dict[str, Any]]:
+    def _events_since(self, since: float) -> List[ScheduleEvent]:
+        """从队尾向前取出时间戳不早于 since 的事件（调用方需持有锁）
+
+        逻辑时钟单调递增，遇到更早的事件即可停止，耗时只与增量大小有关；
+        同一时刻可能有多条事件，因此包含等于 since 的事件，由调用方按内容去重
+        """
+        events = []
+        for e in reversed(self.events):
+            if e.timestamp < since:
+                break
+            events.append(e)
+        events.reverse()
+        return events
+
+    def get_events(self, count: int = 20, since: Optional[float] = None) -> List[Dict[str, Any]]:
         with self.lock:
-            events = self.events[-count:]
+            if since is not None:
+                events = self._events_since(since)
+                if count > 0:
+                    events = events[-count:]
+            elif count > 0:
+                events = list(islice(reversed(self.events), count))[::-1]
+            else:
+                events = list(self.events)
             return [
                 {
                     'timestamp': e.timestamp,
@@ -187,10 +243,11 @@ class RRScheduler:
                 'idle_time': self.stats['idle_time_ms'] / 1000.0,
             }
 
-    def get_gantt_data(self) -> List[Dict[str, Any]]:
+    def get_gantt_data(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
         with self.lock:
+            events = self.events if since is None else self._events_since(since)
             gantt = []
-            for event in self.events:
+            for event in events:
                 if event.event_type in ('dispatch', 'preempt', 'complete'):
                     gantt.append({
                         'pid': event.pid,
@@ -202,6 +259,7 @@ class RRScheduler:
     def set_time_quantum(self, quantum: int):
         with self.lock:
             self.time_quantum = self._quantize_ms(quantum)
+            self.version += 1
 
     # ------------------------- 内部逻辑 -------------------------
     def _scheduler_loop(self):
@@ -226,6 +284,8 @@ class RRScheduler:
                     self.condition.notify_all()
 
             self._run_time_slice()
+            # 每个时间片后主动让出执行权，协作式运行时下避免独占事件循环
+            time.sleep(0)
 
     def _select_next_process(self) -> Optional[int]:
         while self.ready_queue:
@@ -294,6 +354,11 @@ class RRScheduler:
             self._advance_time(slice_ms)
             self.stats['time_slices_used'] += 1
 
+            # 只唤醒获得本时间片的进程
+            event = self._pid_events.get(pid)
+            if event is not None:
+                event.set()
+
             proc.cpu_time += slice_ms / 1000.0
             if proc.remaining_time is not None:
                 proc.remaining_time = max(0, proc.remaining_time - slice_ms)
@@ -322,8 +387,7 @@ class RRScheduler:
         timestamp = self.logical_time_ms / 1000.0
         event = ScheduleEvent(timestamp, event_type, pid, details, remaining_time)
         self.events.append(event)
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        self.version += 1
 
         if self.event_emitter:
             payload = {
@@ -342,6 +406,7 @@ class RRScheduler:
     def _advance_time(self, delta_ms: int):
         step = self._quantize_ms(delta_ms)
         self.logical_time_ms += step
+        self.version += 1
 
     def _quantize_ms(self, value: int) -> int:
         if value <= 0:
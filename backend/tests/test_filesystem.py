@@ -0,0 +1,59 @@
+"""
+文件系统回归测试
+
+在 backend 目录下运行：python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import BLOCK_COUNT, DATA_START_BLOCK
+import core.filesystem as filesystem
+from core.buffer import BufferManager
+from core.disk import VirtualDisk
+from core.filesystem import FileSystem
+
+
+class WriteFileShrinkTest(unittest.TestCase):
+    """write_file 缩小文件后，释放的盘块不应再被原文件写回"""
+
+    def setUp(self):
+        self._io_delay = filesystem.IO_DELAY
+        filesystem.IO_DELAY = 0
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.disk = VirtualDisk(os.path.join(self.tmpdir.name, 'disk.bin'))
+        self.buffer = BufferManager(self.disk)
+        self.fs = FileSystem(self.disk, self.buffer)
+
+    def tearDown(self):
+        self.disk.close()
+        self.tmpdir.cleanup()
+        filesystem.IO_DELAY = self._io_delay
+
+    def test_shrink_then_reuse_blocks(self):
+        # 覆盖直接块、一次间接与二次间接三段
+        self.assertTrue(self.fs.create_file('big', os.urandom(5000))['success'])
+        self.assertTrue(self.fs.write_file('big', b'tiny')['success'])
+
+        # 新文件会复用刚释放的盘块
+        content = os.urandom(5000)
+        self.assertTrue(self.fs.create_file('new', content)['success'])
+        self.assertTrue(self.fs.write_file('big', b'again')['success'])
+        self.assertTrue(self.fs.delete_file('big')['success'])
+        self.buffer.flush_all()
+
+        # 绕过缓冲区直接从磁盘读取，确认新文件的块未被旧文件释放或覆盖
+        self.assertEqual(FileSystem(self.disk).read_file('new')['content'], content)
+        self.assertEqual(self.disk.free_blocks,
+                         BLOCK_COUNT - DATA_START_BLOCK - self._used_blocks())
+
+    def _used_blocks(self) -> int:
+        return sum(1 for b in range(DATA_START_BLOCK, BLOCK_COUNT) if self.disk._get_bit(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
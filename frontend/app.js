@@ -42,6 +42,13 @@ function initSocket() {
         updateStatusIndicator(false);
     });
     
+    // 后端会把短时间内的多个事件合并为一个 batch 帧，这里拆分后交给各事件的监听器
+    state.socket.on('batch', (frames) => {
+        frames.forEach(([event, data]) => {
+            state.socket.listeners(event).forEach(listener => listener(data));
+        });
+    });
+    
     state.socket.on('status_update', (data) => {
         updateDashboard(data);
     });
@@ -354,12 +361,22 @@ async function loadDiskBitmap() {
     try {
         const response = await fetch(`${API_BASE}/api/disk/bitmap`);
         const data = await response.json();
-        renderDiskBitmap(data.bitmap);
+        renderDiskBitmap(unpackBitmap(data.bitmap_b64, data.total));
     } catch (error) {
         console.error('加载磁盘位图失败:', error);
     }
 }
 
+// 位图按位打包传输：块 i 对应第 i >> 3 字节的第 i & 7 位
+function unpackBitmap(b64, total) {
+    const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+    const bits = new Array(total);
+    for (let i = 0; i < total; i++) {
+        bits[i] = (bytes[i >> 3] >> (i & 7)) & 1;
+    }
+    return bits;
+}
+
 function renderDiskBitmap(bitmap) {
     const container = document.getElementById('diskBitmap');
     
@@ -390,7 +407,7 @@ function renderDiskBitmap(bitmap) {
 
 async function showBlockDetail(blockId) {
     try {
-        const response = await fetch(`${API_BASE}/api/disk/block/${blockId}`);
+        const response = await fetch(`${API_BASE}/api/disk/block/${blockId}?encoding=hex`);
         const data = await response.json();
         
         if (data.success) {
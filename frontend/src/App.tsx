@@ -114,6 +114,16 @@ function App() {
       }
     });
 
+    socket.on('files_created_bulk', (data: { created: number; results: Array<{ filename: string; result: { success: boolean } }> }) => {
+      if (data.created > 0) {
+        showToast('success', `批量创建 ${data.created} 个文件`);
+        data.results
+          .filter(r => r.result.success)
+          .forEach(r => addLog('create', `创建文件 ${r.filename}`));
+        triggerFilesRefresh();
+      }
+    });
+
     socket.on('file_updated', (data: { filename: string; result: { success: boolean } }) => {
       if (data.result.success) {
         showToast('success', `文件 ${data.filename} 修改成功`);
@@ -157,6 +167,7 @@ function App() {
       socket.off('disconnect');
       socket.off('status_update');
       socket.off('file_created');
+      socket.off('files_created_bulk');
       socket.off('file_updated');
       socket.off('file_deleted');
       socket.off('directory_created');
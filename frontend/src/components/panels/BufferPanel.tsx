@@ -136,7 +136,7 @@ export default function BufferPanel({ showToast }: BufferPanelProps) {
       <div className="panel-header">
         <div>
           <h2>缓冲区管理</h2>
-          <p className="text-muted">LRU 置换，手动访问块触发置换</p>
+          <p className="text-muted">2Q 置换，手动访问块触发置换</p>
         </div>
       </div>
 
@@ -166,7 +166,7 @@ export default function BufferPanel({ showToast }: BufferPanelProps) {
           </div>
 
           <div className="buffer-controls" style={{ marginTop: "12px" }}>
-            <h3 style={{ margin: 0 }}>缓冲页状态 (LRU置换)</h3>
+            <h3 style={{ margin: 0 }}>缓冲页状态 (2Q置换)</h3>
             <div style={{ display: "flex", gap: "8px", alignItems: "center", flexWrap: "wrap" }}>
               <span style={{ fontSize: "12px", color: "var(--text-muted)" }}>
                 命中率: {hitRate}%
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import {
   getSchedulerStatus,
   startScheduler,
@@ -45,6 +45,8 @@ export default function SchedulerPanel({ stats, showToast }: SchedulerPanelProps
   } | null>(null);
   const [taskProgress, setTaskProgress] = useState<Map<number, TaskProgress>>(new Map());
   const [singleDurationMs, setSingleDurationMs] = useState<number>(3000);
+  // 已拉取事件的最新时间戳，后续只增量查询该时刻及之后的事件
+  const eventsCursor = useRef<number | undefined>(undefined);
 
   const loadStatus = useCallback(async () => {
     try {
@@ -64,9 +66,13 @@ export default function SchedulerPanel({ stats, showToast }: SchedulerPanelProps
 
   const loadEvents = useCallback(async () => {
     try {
-      const data = await getSchedulerEvents(200);
+      const data = await getSchedulerEvents(200, eventsCursor.current);
+      const fetched = data.events || [];
+      if (fetched.length > 0) {
+        eventsCursor.current = fetched[fetched.length - 1].timestamp;
+      }
       setEvents(prev => {
-        const combined = [...prev, ...(data.events || [])];
+        const combined = [...prev, ...fetched];
         const seen = new Set<string>();
         const merged: typeof combined = [];
         for (const e of combined) {
@@ -344,6 +350,7 @@ export default function SchedulerPanel({ stats, showToast }: SchedulerPanelProps
             <button className="btn-small" onClick={async () => {
               try {
                 await clearSchedulerEvents();
+                eventsCursor.current = undefined;
                 setEvents([]);
                 showToast('info', '调度事件已清空');
               } catch {
@@ -10,6 +10,7 @@ import {
   getDiskInfo,
   getBufferStatus,
   getProcesses,
+  getDiskBlock,
   getCurrentPath,
   updateFile,
   formatDisk,
@@ -426,8 +427,7 @@ export default function TerminalPanel() {
             result = '用法: hexdump <block_id>\n示例: hexdump 35 (查看块35的内容)';
           } else {
             const blockId = parseInt(args[0]);
-            const resp = await fetch(`/api/disk/block/${blockId}`);
-            const data = await resp.json();
+            const data = await getDiskBlock(blockId);
             if (data.success) {
               // 格式化为hexdump风格输出
               const hex = data.data;
@@ -42,6 +42,17 @@ export async function createFile(filename: string, content: string): Promise<Api
   });
 }
 
+export async function createFilesBulk(files: Array<{ filename: string; content: string }>): Promise<ApiResponse & {
+  created: number;
+  failed: number;
+  results: Array<{ filename: string; result: ApiResponse }>;
+}> {
+  return fetchApi('/api/files/bulk', {
+    method: 'POST',
+    body: JSON.stringify({ files }),
+  });
+}
+
 export async function readFile(filename: string): Promise<FileReadResponse> {
   return fetchApi<FileReadResponse>(`/api/files/${encodeURIComponent(filename)}`);
 }
@@ -92,12 +103,33 @@ export async function getFileInfo(filename: string): Promise<ApiResponse & {
 }
 
 // Disk APIs
+// 位图按位打包传输：块 i 对应第 i >> 3 字节的第 i & 7 位
+function unpackBitmap(b64: string, total: number): number[] {
+  const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+  const bits = new Array<number>(total);
+  for (let i = 0; i < total; i++) {
+    bits[i] = (bytes[i >> 3] >> (i & 7)) & 1;
+  }
+  return bits;
+}
+
 export async function getDiskBitmap(): Promise<{ bitmap: number[]; total: number; used: number; free: number }> {
-  return fetchApi('/api/disk/bitmap');
+  const data = await fetchApi<{ bitmap_b64: string; total: number; used: number; free: number }>('/api/disk/bitmap');
+  return { ...data, bitmap: unpackBitmap(data.bitmap_b64, data.total) };
+}
+
+// 二进制内容以 base64 传输，显示用的十六进制在客户端生成
+export function base64ToHex(b64: string): string {
+  let hex = '';
+  for (const c of atob(b64)) {
+    hex += c.charCodeAt(0).toString(16).padStart(2, '0');
+  }
+  return hex;
 }
 
-export async function getDiskBlock(blockId: number): Promise<{ success: boolean; block_id: number; data: string; text: string }> {
-  return fetchApi(`/api/disk/block/${blockId}`);
+export async function getDiskBlock(blockId: number): Promise<{ success: boolean; block_id: number; data: string; text: string; error?: string }> {
+  const data = await fetchApi<{ success: boolean; block_id: number; data_b64?: string; text: string; error?: string }>(`/api/disk/block/${blockId}`);
+  return { ...data, data: data.data_b64 ? base64ToHex(data.data_b64) : '' };
 }
 
 export async function formatDisk(): Promise<ApiResponse> {
@@ -195,16 +227,17 @@ export async function setTimeQuantum(quantum: number): Promise<ApiResponse> {
   });
 }
 
-export async function getSchedulerEvents(count = 20): Promise<{ events: Array<{ timestamp: number; type: string; pid: number; details: string; remaining_time?: number | string | null }> }> {
-  return fetchApi(`/api/scheduler/events?count=${count}`);
+export async function getSchedulerEvents(count = 20, since?: number): Promise<{ events: Array<{ timestamp: number; type: string; pid: number; details: string; remaining_time?: number | string | null }> }> {
+  const sinceParam = since !== undefined ? `&since=${since}` : '';
+  return fetchApi(`/api/scheduler/events?count=${count}${sinceParam}`);
 }
 
 export async function clearSchedulerEvents(): Promise<ApiResponse> {
   return fetchApi<ApiResponse>('/api/scheduler/events/clear', { method: 'POST' });
 }
 
-export async function getGanttData(): Promise<{ gantt: Array<{ pid: number; time: number; type: string }> }> {
-  return fetchApi('/api/scheduler/gantt');
+export async function getGanttData(since?: number): Promise<{ gantt: Array<{ pid: number; time: number; type: string }> }> {
+  return fetchApi(since !== undefined ? `/api/scheduler/gantt?since=${since}` : '/api/scheduler/gantt');
 }
 
 // Inode APIs
@@ -269,10 +302,15 @@ export async function deleteSharedMemory(key: number): Promise<ApiResponse> {
 }
 
 export async function readSharedMemory(key: number, offset = 0, length?: number): Promise<ApiResponse & { data: string; hex: string }> {
-  return fetchApi(`/api/shm/${key}/read`, {
+  const result = await fetchApi<ApiResponse & { data_b64?: string; text?: string }>(`/api/shm/${key}/read`, {
     method: 'POST',
     body: JSON.stringify({ offset, length }),
   });
+  return {
+    ...result,
+    data: result.text ?? '',
+    hex: result.data_b64 ? base64ToHex(result.data_b64) : '',
+  };
 }
 
 export async function writeSharedMemory(key: number, data: string, offset = 0): Promise<ApiResponse & { bytes_written: number }> {
@@ -290,6 +328,13 @@ export function connectSocket(): Socket {
     socket = io({
       transports: ['websocket', 'polling'],
     });
+
+    // 后端会把短时间内的多个事件合并为一个 batch 帧，这里拆分后交给各事件的监听器
+    socket.on('batch', (frames: Array<[string, unknown]>) => {
+      frames.forEach(([event, data]) => {
+        socket?.listeners(event).forEach(listener => listener(data));
+      });
+    });
   }
   return socket;
 }